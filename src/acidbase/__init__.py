@@ -2,7 +2,18 @@
 
 # ── Constants ────────────────────────────────────────────────────────
 # ── Cache ────────────────────────────────────────────────────────────
-from acidbase._cache import pkg_cache_dir
+from acidbase._cache import (
+    cache_export,
+    cache_import,
+    cache_index,
+    cache_open,
+    cache_prefetch,
+    cache_read,
+    cache_recompress,
+    cache_remove,
+    cache_write,
+    pkg_cache_dir,
+)
 
 # ── Compression ──────────────────────────────────────────────────────
 from acidbase._compress import compress, decompress
@@ -17,14 +28,19 @@ from acidbase._constants import (
 
 # ── Data manipulation ────────────────────────────────────────────────
 from acidbase._data import (
+    MatchIndex,
+    NestedIndex,
     dupes,
     headtail,
     intersect_all,
+    intersection_counts,
     intersection_matrix,
     keep_only_atomic_cols,
     match_all,
     match_nested,
     not_dupes,
+    optimize_dtypes,
+    pairwise_overlap,
 )
 
 # ── Display helpers ──────────────────────────────────────────────────
@@ -48,10 +64,17 @@ from acidbase._file import (
 
 # ── Math / statistics ────────────────────────────────────────────────
 from acidbase._math import (
+    RunningStats,
     euclidean,
     fold_change_to_log_ratio,
     geometric_mean,
+    grouped_geometric_mean,
+    grouped_sem,
+    grouped_zscore,
+    knn,
     log_ratio_to_fold_change,
+    pairwise_euclidean,
+    quantile_normalize,
     ranked_matrix,
     sem,
     zscore,
@@ -101,6 +124,11 @@ from acidbase._version import (
 )
 
 __all__ = [
+    # data
+    "MatchIndex",
+    "NestedIndex",
+    # math
+    "RunningStats",
     # path string
     "add_to_path_end",
     "add_to_path_start",
@@ -108,6 +136,16 @@ __all__ = [
     "barcode_pattern",
     # file
     "basename_sans_ext",
+    # cache
+    "cache_export",
+    "cache_import",
+    "cache_index",
+    "cache_open",
+    "cache_prefetch",
+    "cache_read",
+    "cache_recompress",
+    "cache_remove",
+    "cache_write",
     "collapse_to_path_string",
     # compression
     "compress",
@@ -116,9 +154,7 @@ __all__ = [
     "decompress",
     # download
     "download",
-    # data
     "dupes",
-    # math
     "euclidean",
     "file_depth",
     "file_ext",
@@ -127,11 +163,16 @@ __all__ = [
     "geometric_mean",
     "git_current_branch",
     "git_default_branch",
+    "grouped_geometric_mean",
+    "grouped_sem",
+    "grouped_zscore",
     "headtail",
     "init_dir",
     "intersect_all",
+    "intersection_counts",
     "intersection_matrix",
     "keep_only_atomic_cols",
+    "knn",
     "lane_pattern",
     "log_ratio_to_fold_change",
     # version
@@ -143,13 +184,16 @@ __all__ = [
     "metrics_cols",
     "minor_version",
     "not_dupes",
+    "optimize_dtypes",
+    "pairwise_euclidean",
+    "pairwise_overlap",
     "parent_dir",
     "parent_directory",
     "paste_url",
-    # cache
     "pkg_cache_dir",
     # string
     "print_string",
+    "quantile_normalize",
     "quietly",
     "ram",
     "random_string",
@@ -2,8 +2,33 @@
 
 from __future__ import annotations
 
+import hashlib
+import io
+import json
 import os
+import shutil
+import tarfile
+import tempfile
+import threading
+import time
+import warnings
+from collections.abc import Callable, Mapping, Sequence
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
+from typing import IO, Any
+
+from acidbase._compress import _codec_open, _codecs
+from acidbase._download import download
+from acidbase._system import cpus
+
+_index_name = "index.json"
+"""File name of the cache entry index, relative to the cache directory."""
+
+_entries_name = "entries"
+"""Subdirectory holding the (possibly compressed) cache entry files."""
+
+_index_lock = threading.Lock()
+"""Serialise read-modify-write cycles on the index within a process."""
 
 
 def pkg_cache_dir(
@@ -32,3 +57,395 @@ def pkg_cache_dir(
     cache_dir = base / package
     cache_dir.mkdir(parents=True, exist_ok=True)
     return str(cache_dir)
+
+
+def _read_index(cache_dir: Path) -> dict[str, dict[str, Any]]:
+    """Load the entry index, returning an empty mapping if absent."""
+    path = cache_dir / _index_name
+    if not path.is_file():
+        return {}
+    with open(path, encoding="utf-8") as f:
+        return json.load(f)
+
+
+def _write_index(cache_dir: Path, index: dict[str, dict[str, Any]]) -> None:
+    """Atomically replace the entry index."""
+    fd, tmp = tempfile.mkstemp(dir=cache_dir, prefix=".index-", suffix=".json")
+    with os.fdopen(fd, "w", encoding="utf-8") as f:
+        json.dump(index, f, indent=2, sort_keys=True)
+    os.replace(tmp, cache_dir / _index_name)
+
+
+def _entry_file(key: str, codec: str) -> str:
+    """Return the entry file name for *key*, relative to the entries directory."""
+    digest = hashlib.sha256(key.encode("utf-8")).hexdigest()
+    suffix = "" if codec == "none" else _codecs[codec][0]
+    return f"{digest}{suffix}"
+
+
+def cache_index(package: str = "acidbase") -> dict[str, dict[str, Any]]:
+    """Return the cache entry index.
+
+    Parameters
+    ----------
+    package : str
+
+    Returns
+    -------
+    dict
+        Mapping of entry key to a record with ``file``, ``codec``,
+        ``size`` (decoded bytes), ``stored_size`` (bytes on disk), and
+        ``created`` (Unix time).
+    """
+    return _read_index(Path(pkg_cache_dir(package)))
+
+
+def cache_write(
+    key: str,
+    data: bytes | str | Path,
+    *,
+    codec: str = "gz",
+    package: str = "acidbase",
+) -> str:
+    """Store an entry in the package cache, compressed at rest.
+
+    Parameters
+    ----------
+    key : str
+        Entry key. Any string is allowed; the file name is derived from
+        its hash.
+    data : bytes, str, or Path
+        Entry content. ``str`` is encoded as UTF-8. A :class:`~pathlib.Path`
+        is treated as a source file and streamed into the cache.
+    codec : str
+        ``'none'``, ``'fast'``, ``'gz'``, ``'bz2'``, or ``'xz'``
+        (default ``'gz'``). Use ``'fast'`` for hot entries and ``'xz'``
+        for cold ones.
+    package : str
+
+    Returns
+    -------
+    str
+        Path to the stored entry file.
+    """
+    if codec != "none" and codec not in _codecs:
+        raise ValueError(f"Unsupported codec {codec!r}.")
+    cache_dir = Path(pkg_cache_dir(package))
+    entries = cache_dir / _entries_name
+    entries.mkdir(exist_ok=True)
+    name = _entry_file(key, codec)
+    fd, tmp = tempfile.mkstemp(dir=entries, prefix=".tmp-")
+    os.close(fd)
+    try:
+        with _codec_open(tmp, "wb", codec=codec) as f_out:
+            if isinstance(data, Path):
+                with open(data, "rb") as f_in:
+                    shutil.copyfileobj(f_in, f_out)
+            else:
+                f_out.write(data.encode("utf-8") if isinstance(data, str) else data)
+            size = f_out.tell()
+        os.replace(tmp, entries / name)
+    except BaseException:
+        os.unlink(tmp)
+        raise
+    with _index_lock:
+        index = _read_index(cache_dir)
+        old = index.get(key)
+        if old is not None and old["file"] != name:
+            (entries / old["file"]).unlink(missing_ok=True)
+        index[key] = {
+            "file": name,
+            "codec": codec,
+            "size": size,
+            "stored_size": (entries / name).stat().st_size,
+            "created": time.time(),
+        }
+        _write_index(cache_dir, index)
+    return str(entries / name)
+
+
+def cache_open(key: str, *, package: str = "acidbase") -> IO[bytes]:
+    """Open a cache entry for reading, decoding it transparently.
+
+    Parameters
+    ----------
+    key : str
+    package : str
+
+    Returns
+    -------
+    file object
+        Binary file object yielding the decoded content.
+
+    Raises
+    ------
+    KeyError
+        If *key* is not in the cache.
+    """
+    cache_dir = Path(pkg_cache_dir(package))
+    record = _read_index(cache_dir).get(key)
+    if record is None:
+        raise KeyError(f"{key!r} not found in cache")
+    return _codec_open(cache_dir / _entries_name / record["file"], "rb", codec=record["codec"])
+
+
+def cache_read(key: str, *, package: str = "acidbase") -> bytes:
+    """Return the decoded content of a cache entry.
+
+    Parameters
+    ----------
+    key : str
+    package : str
+
+    Returns
+    -------
+    bytes
+
+    Raises
+    ------
+    KeyError
+        If *key* is not in the cache.
+    """
+    with cache_open(key, package=package) as f:
+        return f.read()
+
+
+def cache_recompress(key: str, codec: str, *, package: str = "acidbase") -> str:
+    """Re-encode an existing cache entry with a different codec.
+
+    Parameters
+    ----------
+    key : str
+    codec : str
+        Target codec, as for :func:`cache_write`.
+    package : str
+
+    Returns
+    -------
+    str
+        Path to the re-encoded entry file.
+
+    Raises
+    ------
+    KeyError
+        If *key* is not in the cache.
+    """
+    cache_dir = Path(pkg_cache_dir(package))
+    record = _read_index(cache_dir).get(key)
+    if record is None:
+        raise KeyError(f"{key!r} not found in cache")
+    src = cache_dir / _entries_name / record["file"]
+    if record["codec"] == codec:
+        return str(src)
+    fd, tmp = tempfile.mkstemp(dir=cache_dir, prefix=".tmp-")
+    os.close(fd)
+    try:
+        with _codec_open(src, "rb", codec=record["codec"]) as f_in, open(tmp, "wb") as f_out:
+            shutil.copyfileobj(f_in, f_out)
+        return cache_write(key, Path(tmp), codec=codec, package=package)
+    finally:
+        os.unlink(tmp)
+
+
+def cache_remove(key: str, *, package: str = "acidbase") -> bool:
+    """Delete a cache entry.
+
+    Parameters
+    ----------
+    key : str
+    package : str
+
+    Returns
+    -------
+    bool
+        ``True`` if an entry was deleted.
+    """
+    cache_dir = Path(pkg_cache_dir(package))
+    with _index_lock:
+        index = _read_index(cache_dir)
+        record = index.pop(key, None)
+        if record is None:
+            return False
+        (cache_dir / _entries_name / record["file"]).unlink(missing_ok=True)
+        _write_index(cache_dir, index)
+    return True
+
+
+def _prefetch_spec(spec: str | Mapping[str, Any]) -> dict[str, Any]:
+    """Normalise a manifest entry to a mapping with a ``key``, validating it."""
+    spec = {"url": spec} if isinstance(spec, str) else dict(spec)
+    spec.setdefault("key", spec.get("url"))
+    if spec["key"] is None:
+        raise ValueError(f"Manifest entry needs a 'key' or 'url': {spec!r}.")
+    if "url" not in spec and "func" not in spec:
+        raise ValueError(f"Manifest entry needs a 'url' or 'func': {spec!r}.")
+    return spec
+
+
+def _prefetch_one(spec: dict[str, Any], *, codec: str, package: str) -> None:
+    """Fill the cache entry of one normalised manifest entry."""
+    codec = spec.get("codec", codec)
+    if "url" in spec:
+        tmp = tempfile.mkdtemp(prefix=".prefetch-", dir=pkg_cache_dir(package))
+        try:
+            path = download(spec["url"], dest=Path(tmp) / "download")
+            cache_write(spec["key"], Path(path), codec=codec, package=package)
+        finally:
+            shutil.rmtree(tmp, ignore_errors=True)
+    else:
+        func: Callable[..., bytes | str | Path] = spec["func"]
+        data = func(*spec.get("args", ()), **spec.get("kwargs", {}))
+        cache_write(spec["key"], data, codec=codec, package=package)
+
+
+def cache_prefetch(
+    manifest: Sequence[str | Mapping[str, Any]],
+    *,
+    codec: str = "gz",
+    workers: int = 0,
+    package: str = "acidbase",
+) -> dict[str, list[str]]:
+    """Populate the package cache from a manifest, concurrently.
+
+    Entries already present in the cache are left untouched, and only
+    the first entry of a repeated key is used. An entry
+    that fails to download or compute does not stop the others: its key
+    is reported as failed and a :class:`RuntimeWarning` gives the error.
+
+    Parameters
+    ----------
+    manifest : sequence of str or mapping
+        Each element is either a URL string (cached under the URL as its
+        key) or a mapping with a ``key`` and either a ``url`` or a
+        ``func`` callable plus optional ``args`` and ``kwargs``. The
+        callable must return ``bytes``, ``str``, or a
+        :class:`~pathlib.Path`, as accepted by :func:`cache_write`.
+        A mapping may also set its own ``codec``.
+    codec : str
+        Default codec for filled entries (default ``'gz'``).
+    workers : int
+        Maximum number of threads. Use ``0`` (default) for all
+        available CPUs.
+    package : str
+
+    Returns
+    -------
+    dict
+        ``{"hits": [...], "fills": [...], "failed": [...]}`` listing entry
+        keys that were already cached, keys that were filled, and keys
+        that could not be filled, in manifest order. Each key is listed
+        once.
+
+    Raises
+    ------
+    ValueError
+        If a manifest entry has neither a ``url`` nor a ``func``. The
+        manifest is validated before anything is fetched.
+    """
+    specs: dict[str, dict[str, Any]] = {}
+    for spec in map(_prefetch_spec, manifest):
+        # A repeated key would race to write the same entry; keep the first.
+        specs.setdefault(spec["key"], spec)
+    cached = set(cache_index(package))
+    report: dict[str, list[str]] = {"hits": [], "fills": [], "failed": []}
+    with ThreadPoolExecutor(max_workers=cpus(workers)) as pool:
+        futures = {
+            spec["key"]: pool.submit(_prefetch_one, spec, codec=codec, package=package)
+            for spec in specs.values()
+            if spec["key"] not in cached
+        }
+        for key in specs:
+            if key not in futures:
+                report["hits"].append(key)
+                continue
+            error = futures[key].exception()
+            if error is None:
+                report["fills"].append(key)
+            else:
+                report["failed"].append(key)
+                warnings.warn(
+                    f"Failed to prefetch {key!r}: {error}",
+                    RuntimeWarning,
+                    stacklevel=2,
+                )
+    return report
+
+
+def cache_export(path: str | Path, *, package: str = "acidbase") -> str:
+    """Export the cache entries and their index to a single archive.
+
+    Entries are stored as-is, so the archive is an uncompressed tar of
+    already compressed files.
+
+    Parameters
+    ----------
+    path : str or Path
+        Destination archive (``.tar``).
+    package : str
+
+    Returns
+    -------
+    str
+        Path to the archive.
+    """
+    cache_dir = Path(pkg_cache_dir(package))
+    path = Path(path)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    with _index_lock:
+        index = _read_index(cache_dir)
+        with tarfile.open(path, "w") as tar:
+            for record in index.values():
+                name = f"{_entries_name}/{record['file']}"
+                tar.add(cache_dir / name, arcname=name)
+            payload = json.dumps(index, indent=2, sort_keys=True).encode("utf-8")
+            info = tarfile.TarInfo(_index_name)
+            info.size = len(payload)
+            info.mtime = int(time.time())
+            tar.addfile(info, io.BytesIO(payload))
+    return str(path)
+
+
+def cache_import(
+    path: str | Path,
+    *,
+    overwrite: bool = False,
+    package: str = "acidbase",
+) -> list[str]:
+    """Import cache entries from an archive made by :func:`cache_export`.
+
+    Parameters
+    ----------
+    path : str or Path
+        Archive to import.
+    overwrite : bool
+        Replace entries that are already cached (default ``False``).
+    package : str
+
+    Returns
+    -------
+    list[str]
+        Keys of the imported entries.
+    """
+    cache_dir = Path(pkg_cache_dir(package))
+    entries = cache_dir / _entries_name
+    entries.mkdir(exist_ok=True)
+    imported: list[str] = []
+    with tarfile.open(path, "r") as tar:
+        src_file = tar.extractfile(_index_name)
+        if src_file is None:
+            raise ValueError(f"{str(path)!r} has no cache index.")
+        src_index: dict[str, dict[str, Any]] = json.load(src_file)
+        with _index_lock:
+            index = _read_index(cache_dir)
+            for key, record in src_index.items():
+                if key in index and not overwrite:
+                    continue
+                member = tar.getmember(f"{_entries_name}/{record['file']}")
+                tar.extract(member, cache_dir, filter="data")
+                old = index.get(key)
+                if old is not None and old["file"] != record["file"]:
+                    (entries / old["file"]).unlink(missing_ok=True)
+                index[key] = record
+                imported.append(key)
+            _write_index(cache_dir, index)
+    return imported
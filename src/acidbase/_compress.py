@@ -7,7 +7,36 @@ import gzip
 import lzma
 import shutil
 import zipfile
+from collections.abc import Callable
+from functools import partial
 from pathlib import Path
+from typing import IO
+
+_codecs: dict[str, tuple[str, Callable[..., IO[bytes]]]] = {
+    "gz": (".gz", gzip.open),
+    "bz2": (".bz2", bz2.open),
+    "xz": (".xz", lzma.open),
+    "fast": (".gz", partial(gzip.open, compresslevel=1)),
+}
+"""Streaming codecs, keyed by method name, as ``(suffix, opener)``.
+
+``"fast"`` writes standard gzip at the lowest compression level, trading
+ratio for throughput. It decodes with :func:`gzip.open` like ``"gz"``.
+"""
+
+
+def _codec_open(path: str | Path, mode: str, *, codec: str) -> IO[bytes]:
+    """Open *path* in binary *mode* through a named codec.
+
+    ``"none"`` opens the file uncompressed.
+    """
+    if codec == "none":
+        return open(path, mode)
+    if codec not in _codecs:
+        raise ValueError(
+            f"Unsupported codec {codec!r}. Use 'none', {', '.join(map(repr, _codecs))}."
+        )
+    return _codecs[codec][1](path, mode)
 
 
 def compress(
@@ -36,15 +65,9 @@ def compress(
     if not path.is_file():
         raise FileNotFoundError(str(path))
 
-    openers = {
-        "gz": (gzip.open, f"{path}.gz"),
-        "bz2": (bz2.open, f"{path}.bz2"),
-        "xz": (lzma.open, f"{path}.xz"),
-    }
-
-    if method in openers:
-        opener, out_path = openers[method]
-        with open(path, "rb") as f_in, opener(out_path, "wb") as f_out:
+    if method in _codecs and method != "fast":
+        out_path = f"{path}{_codecs[method][0]}"
+        with open(path, "rb") as f_in, _codec_open(out_path, "wb", codec=method) as f_out:
             shutil.copyfileobj(f_in, f_out)
     elif method == "zip":
         out_path = f"{path}.zip"
@@ -81,11 +104,7 @@ def decompress(
     suffix = path.suffix.lower()
     out_path = str(path.with_suffix(""))
 
-    openers = {
-        ".gz": gzip.open,
-        ".bz2": bz2.open,
-        ".xz": lzma.open,
-    }
+    openers = {suffix: opener for method, (suffix, opener) in _codecs.items() if method != "fast"}
 
     if suffix in openers:
         with openers[suffix](path, "rb") as f_in, open(out_path, "wb") as f_out:
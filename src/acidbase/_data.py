@@ -2,70 +2,351 @@
 
 from __future__ import annotations
 
-from collections.abc import Hashable, Sequence
+import os
+from collections import deque
+from collections.abc import Hashable, Iterable, Iterator, Sequence
 from functools import reduce
-from typing import Any
+from itertools import islice
+from pathlib import Path
+from typing import Any, Literal
 
 import numpy as np
 import pandas as pd
+import scipy.sparse
 
+from acidbase._compress import _codec_open, _codecs
 
-def dupes(x: Sequence[Hashable]) -> list:
-    """Return duplicated elements.
+_ArrayLike = np.ndarray | pd.Series | pd.Index
+"""Array and pandas types handled by the vectorised code paths."""
 
-    Parameters
-    ----------
-    x : sequence
 
-    Returns
-    -------
-    list
-        Sorted list of values appearing more than once.
+def _count_values(
+    x: Sequence[Hashable] | _ArrayLike,
+    *,
+    sort: bool,
+) -> tuple[list | np.ndarray, list[int] | np.ndarray]:
+    """Return unique values of *x* and their counts.
+
+    Arrays and pandas objects are factorised in one vectorised pass and
+    sorted in their natural (e.g. numeric) order. Plain sequences are
+    counted with a dict and sorted by their string representation.
     """
+    if isinstance(x, _ArrayLike):
+        values = x.ravel() if isinstance(x, np.ndarray) else x
+        codes, uniques = pd.factorize(values, sort=sort, use_na_sentinel=False)
+        return np.asarray(uniques), np.bincount(codes, minlength=len(uniques))
     seen: dict[Hashable, int] = {}
     for item in x:
         seen[item] = seen.get(item, 0) + 1
-    return sorted((k for k, v in seen.items() if v > 1), key=str)
+    keys = sorted(seen, key=str) if sort else list(seen)
+    return keys, [seen[k] for k in keys]
+
+
+def _filter_counts(
+    values: list | np.ndarray,
+    counts: list[int] | np.ndarray,
+    *,
+    dupes: bool,
+) -> tuple[list | np.ndarray, list[int] | np.ndarray]:
+    """Keep values appearing more than once, or exactly once."""
+    if isinstance(values, np.ndarray):
+        keep = counts > 1 if dupes else counts == 1
+        return values[keep], np.asarray(counts)[keep]
+    pairs = [(v, n) for v, n in zip(values, counts, strict=True) if (n > 1) == dupes]
+    return [v for v, _ in pairs], [n for _, n in pairs]
+
+
+def _row_groups(df: pd.DataFrame) -> np.ndarray:
+    """Return a group id per row of *df*, equal for identical rows.
+
+    Rows are hashed to ``uint64`` and grouped on the hashes. Rows that
+    share a hash are compared with the first row of their group, and on
+    a hash collision the groups are recomputed exactly with
+    :meth:`pandas.DataFrame.groupby`. Group ids follow first appearance.
+    """
+    hashes = pd.util.hash_pandas_object(df, index=False).to_numpy()
+    codes, uniques = pd.factorize(hashes)
+    shared = np.flatnonzero(np.bincount(codes, minlength=len(uniques))[codes] > 1)
+    if len(shared) == 0:
+        return codes
+    # Codes are numbered by first appearance, so a row starts a new group
+    # exactly when its code exceeds every earlier code.
+    first = np.flatnonzero(np.r_[True, codes[1:] > np.maximum.accumulate(codes)[:-1]])
+    left = df.iloc[shared].reset_index(drop=True)
+    right = df.iloc[first[codes[shared]]].reset_index(drop=True)
+    same = (left == right) | (left.isna() & right.isna())
+    if same.all(axis=None):
+        return codes
+    return df.groupby(list(range(df.shape[1])), dropna=False, sort=False).ngroup().to_numpy()
+
+
+def _row_dupes(
+    df: pd.DataFrame,
+    *,
+    dupes: bool,
+    sort: bool,
+) -> tuple[pd.Series | pd.Index, np.ndarray]:
+    """Return duplicated (or unique) rows of *df* and their group sizes."""
+    codes = _row_groups(df.set_axis(range(df.shape[1]), axis=1))
+    sizes = np.bincount(codes)
+    keep = sizes[codes] > 1 if dupes else sizes[codes] == 1
+    if not dupes:
+        return df.index[keep], sizes[codes[keep]]
+    group_codes, groups = pd.factorize(codes[keep])
+    out = pd.Series(group_codes, index=df.index[keep], name="group")
+    if sort:
+        out = out.sort_values(kind="stable")
+    return out, sizes[groups]
+
+
+def dupes(
+    x: Sequence[Hashable] | _ArrayLike | pd.DataFrame,
+    *,
+    sort: bool = True,
+    counts: bool = False,
+) -> list | np.ndarray | pd.Series | tuple[list | np.ndarray | pd.Series, list[int] | np.ndarray]:
+    """Return duplicated elements.
 
+    Parameters
+    ----------
+    x : sequence, numpy.ndarray, pandas.Series, pandas.Index, or pandas.DataFrame
+        Arrays and pandas objects use a vectorised path. Data frames are
+        compared row-wise, by hashing each row.
+    sort : bool
+        Sort the result (default ``True``). Plain sequences are sorted by
+        string representation; arrays in their natural order. If
+        ``False``, values are returned in order of first appearance. For
+        data frames, rows are ordered by group rather than by position.
+    counts : bool
+        Also return the number of occurrences of each value, or the size
+        of each row group for data frames.
 
-def not_dupes(x: Sequence[Hashable]) -> list:
+    Returns
+    -------
+    list, numpy.ndarray, or pandas.Series, or tuple
+        Values appearing more than once: a list for plain sequences, an
+        array otherwise. For data frames, a ``group`` series of group ids
+        (numbered by first appearance) indexed by the labels of all
+        duplicated rows. With ``counts=True``, a ``(values, counts)``
+        tuple.
+    """
+    if isinstance(x, pd.DataFrame):
+        rows, n = _row_dupes(x, dupes=True, sort=sort)
+        return (rows, n) if counts else rows
+    values, n = _filter_counts(*_count_values(x, sort=sort), dupes=True)
+    return (values, n) if counts else values
+
+
+def not_dupes(
+    x: Sequence[Hashable] | _ArrayLike | pd.DataFrame,
+    *,
+    sort: bool = True,
+    counts: bool = False,
+) -> list | np.ndarray | pd.Index | tuple[list | np.ndarray | pd.Index, list[int] | np.ndarray]:
     """Return elements that appear exactly once.
 
     Parameters
     ----------
-    x : sequence
+    x : sequence, numpy.ndarray, pandas.Series, pandas.Index, or pandas.DataFrame
+        Arrays and pandas objects use a vectorised path. Data frames are
+        compared row-wise, as in :func:`dupes`.
+    sort : bool
+        Sort the result (default ``True``), as in :func:`dupes`. Ignored
+        for data frames.
+    counts : bool
+        Also return the number of occurrences of each value (all ``1``).
 
     Returns
     -------
-    list
+    list, numpy.ndarray, or pandas.Index, or tuple
+        Values appearing once: a list for plain sequences, an array
+        otherwise. For data frames, the labels of the unique rows. With
+        ``counts=True``, a ``(values, counts)`` tuple.
     """
-    seen: dict[Hashable, int] = {}
-    for item in x:
-        seen[item] = seen.get(item, 0) + 1
-    return sorted((k for k, v in seen.items() if v == 1), key=str)
+    if isinstance(x, pd.DataFrame):
+        rows, n = _row_dupes(x, dupes=False, sort=sort)
+        return (rows, n) if counts else rows
+    values, n = _filter_counts(*_count_values(x, sort=sort), dupes=False)
+    return (values, n) if counts else values
+
 
+def _intersect_presorted(a: np.ndarray, b: np.ndarray) -> np.ndarray:
+    """Intersect sorted unique *a* with sorted *b* by binary search."""
+    if len(b) == 0:
+        return a[:0]
+    idx = np.minimum(np.searchsorted(b, a), len(b) - 1)
+    return a[b[idx] == a]
+
+
+def _comparable_dtypes(arrays: Sequence[np.ndarray]) -> bool:
+    """Check that *arrays* share a dtype family NumPy can compare without casting.
+
+    All numeric (including Boolean) arrays qualify, as do arrays that are
+    all Unicode strings, all byte strings, or all of one datetime or
+    timedelta kind. Mixed families (e.g. integers and strings) would be
+    promoted to strings by NumPy, so they do not.
+    """
+    kinds = {a.dtype.kind for a in arrays}
+    if not (kinds <= set("biuf") or (len(kinds) == 1 and kinds <= set("USmM"))):
+        return False
+    try:
+        np.result_type(*arrays)
+    except TypeError:
+        return False
+    return True
 
-def intersect_all(*args: Sequence) -> list:
+
+def intersect_all(*args: Sequence | _ArrayLike, presorted: bool = False) -> list | np.ndarray:
     """Return the intersection of multiple sequences.
 
+    When every input is a NumPy array (or pandas Series/Index) and all
+    share a comparable non-object dtype (e.g. all numeric or all
+    strings), the intersection is computed with NumPy, starting
+    from the smallest input, and returned as a sorted array.
+
     Parameters
     ----------
-    *args : sequence
+    *args : sequence, numpy.ndarray, pandas.Series, or pandas.Index
+    presorted : bool
+        Declare that array inputs are already sorted ascending, so that
+        sorting is skipped and each input is searched with binary search
+        instead (default ``False``). Ignored for plain sequences.
 
     Returns
     -------
-    list
+    list or numpy.ndarray
+        Common values: a list sorted by string representation for plain
+        sequences, or an array in natural (e.g. numeric) order.
     """
     if not args:
         return []
+    if all(isinstance(a, _ArrayLike) for a in args):
+        arrays = sorted((np.asarray(a).ravel() for a in args), key=len)
+        if _comparable_dtypes(arrays):
+            if presorted:
+                first = arrays[0]
+                result = first[np.r_[True, first[1:] != first[:-1]]] if len(first) else first
+            else:
+                result = np.unique(arrays[0])
+            for arr in arrays[1:]:
+                if len(result) == 0:
+                    break
+                if presorted:
+                    result = _intersect_presorted(result, arr)
+                else:
+                    result = np.intersect1d(result, arr, assume_unique=False)
+            return result
     sets = [set(a) for a in args]
     result = reduce(lambda a, b: a & b, sets)
     return sorted(result, key=str)
 
 
-def intersection_matrix(*args: Sequence, names: Sequence[str] | None = None) -> pd.DataFrame:
+def _incidence(*args: Sequence | _ArrayLike) -> tuple[pd.Index, scipy.sparse.csr_array]:
+    """Factorise the union of *args* into a sparse item-by-set incidence matrix.
+
+    Returns the sorted union of items and a Boolean CSR array with one
+    row per item and one column per collection.
+    """
+    if not args:
+        return pd.Index([]), scipy.sparse.csr_array((0, 0), dtype=bool)
+    parts = [pd.Series(a if isinstance(a, _ArrayLike) else list(a)) for a in args]
+    codes, uniques = pd.factorize(
+        pd.concat(parts, ignore_index=True), sort=True, use_na_sentinel=False
+    )
+    cols = np.repeat(np.arange(len(parts)), [len(p) for p in parts])
+    # Duplicate (row, col) pairs are summed on conversion, which is a
+    # logical OR for Boolean data.
+    mat = scipy.sparse.coo_array(
+        (np.ones(len(codes), dtype=bool), (codes, cols)),
+        shape=(len(uniques), len(parts)),
+    ).tocsr()
+    return pd.Index(uniques), mat
+
+
+def intersection_matrix(
+    *args: Sequence | _ArrayLike,
+    names: Sequence[str] | None = None,
+    sparse: bool = False,
+) -> pd.DataFrame:
     """Build a Boolean intersection matrix.
 
+    Parameters
+    ----------
+    *args : sequence
+        Collections to compare.
+    names : sequence of str, optional
+        Labels for each collection.
+    sparse : bool
+        Return a data frame with sparse Boolean columns (default
+        ``False``). The underlying :mod:`scipy.sparse` matrix is
+        available via ``DataFrame.sparse.to_coo()``.
+
+    Returns
+    -------
+    pandas.DataFrame
+        One row per item in the sorted union and one column per
+        collection.
+    """
+    if names is None:
+        names = [f"set{i + 1}" for i in range(len(args))]
+    items, mat = _incidence(*args)
+    if sparse:
+        return pd.DataFrame.sparse.from_spmatrix(mat, index=items, columns=list(names))
+    return pd.DataFrame(mat.toarray(), index=items, columns=list(names))
+
+
+def pairwise_overlap(
+    *args: Sequence | _ArrayLike,
+    metric: str = "count",
+    names: Sequence[str] | None = None,
+) -> pd.DataFrame:
+    """Compute pairwise overlaps between collections.
+
+    Overlaps are computed in a single sparse matrix product of the
+    item-by-collection incidence matrix with itself.
+
+    Parameters
+    ----------
+    *args : sequence
+        Collections to compare. Duplicate items within a collection are
+        counted once.
+    metric : str
+        ``'count'`` (default) for intersection sizes, or ``'jaccard'``
+        for the Jaccard index (intersection over union). The Jaccard
+        index of two empty collections is ``NaN``.
+    names : sequence of str, optional
+        Labels for each collection.
+
+    Returns
+    -------
+    pandas.DataFrame
+        Symmetric collection-by-collection matrix. With ``'count'``, the
+        diagonal holds the size of each collection.
+    """
+    if metric not in ("count", "jaccard"):
+        raise ValueError(f"Unsupported metric {metric!r}. Use 'count' or 'jaccard'.")
+    if names is None:
+        names = [f"set{i + 1}" for i in range(len(args))]
+    _, mat = _incidence(*args)
+    mat = mat.astype(np.int64)
+    counts = (mat.T @ mat).toarray()
+    if metric == "count":
+        return pd.DataFrame(counts, index=list(names), columns=list(names))
+    sizes = np.diag(counts)
+    union = sizes[:, None] + sizes[None, :] - counts
+    jaccard = np.divide(counts, union, out=np.full(counts.shape, np.nan), where=union > 0)
+    return pd.DataFrame(jaccard, index=list(names), columns=list(names))
+
+
+def intersection_counts(
+    *args: Sequence | _ArrayLike,
+    names: Sequence[str] | None = None,
+) -> pd.DataFrame:
+    """Count items in every exclusive membership combination.
+
+    Each item's membership across the collections is packed into a
+    bitmask, and identical bitmasks are counted, as for an UpSet plot.
+
     Parameters
     ----------
     *args : sequence
@@ -76,43 +357,150 @@ def intersection_matrix(*args: Sequence, names: Sequence[str] | None = None) ->
     Returns
     -------
     pandas.DataFrame
+        One row per observed combination, with a Boolean column per
+        collection and a ``count`` column, sorted by decreasing count.
     """
     if names is None:
         names = [f"set{i + 1}" for i in range(len(args))]
-    all_items = sorted(set().union(*args))
-    data = {
-        name: [item in set(s) for item in all_items] for name, s in zip(names, args, strict=False)
+    _, mat = _incidence(*args)
+    packed = np.packbits(mat.toarray(), axis=1)
+    combos, counts = np.unique(packed, axis=0, return_counts=True)
+    membership = np.unpackbits(combos, axis=1, count=len(args)).astype(bool)
+    out = pd.DataFrame(membership, columns=list(names))
+    out["count"] = counts
+    return out.sort_values("count", ascending=False, kind="stable", ignore_index=True)
+
+
+_atomic_inferred: frozenset[str] = frozenset(
+    {
+        "boolean",
+        "bytes",
+        "complex",
+        "date",
+        "datetime",
+        "datetime64",
+        "decimal",
+        "empty",
+        "floating",
+        "integer",
+        "interval",
+        "mixed-integer-float",
+        "period",
+        "string",
+        "time",
+        "timedelta",
+        "timedelta64",
     }
-    return pd.DataFrame(data, index=all_items)
+)
+"""Results of :func:`pandas.api.types.infer_dtype` that imply scalar values."""
 
+_nonatomic_types: tuple[type, ...] = (list, dict, set, np.ndarray)
+"""Element types that make a column non-atomic."""
 
-def keep_only_atomic_cols(df: pd.DataFrame) -> pd.DataFrame:
+
+def keep_only_atomic_cols(df: pd.DataFrame, *, sample: int | None = None) -> pd.DataFrame:
     """Keep only columns that contain scalar (atomic) values.
 
     Drops columns whose elements are lists, dicts, or other
-    non-scalar types.
+    non-scalar types. Columns with a non-object dtype (numeric,
+    categorical, string, and other extension dtypes) are kept without
+    inspecting their values. Object columns are classified with
+    :func:`pandas.api.types.infer_dtype`, and only mixed columns are
+    scanned element by element.
+
+    Parameters
+    ----------
+    df : pandas.DataFrame
+    sample : int, optional
+        Inspect at most this many evenly spaced values per object
+        column. By default, all values are inspected.
+
+    Returns
+    -------
+    pandas.DataFrame
+    """
+    keep = np.ones(df.shape[1], dtype=bool)
+    for i, dtype in enumerate(df.dtypes):
+        if not pd.api.types.is_object_dtype(dtype):
+            continue
+        values = df.iloc[:, i].to_numpy()
+        if sample is not None and len(values) > sample:
+            values = values[np.linspace(0, len(values) - 1, sample).astype(np.intp)]
+        if pd.api.types.infer_dtype(values, skipna=True) in _atomic_inferred:
+            continue
+        keep[i] = not any(isinstance(v, _nonatomic_types) for v in values)
+    return df.iloc[:, keep]
+
+
+def optimize_dtypes(
+    df: pd.DataFrame,
+    *,
+    max_unique_ratio: float = 0.5,
+    downcast_float: bool = False,
+    verbose: bool = False,
+) -> pd.DataFrame:
+    """Reduce the memory footprint of a data frame.
+
+    Integer columns are downcast to the smallest integer type that holds
+    their values. Low-cardinality string columns become ``category``, and
+    the remaining object columns of strings become Arrow-backed strings
+    (with ``NaN`` as the missing value) when :mod:`pyarrow` is installed.
+    Columns that are already Arrow-backed are left as they are.
 
     Parameters
     ----------
     df : pandas.DataFrame
+    max_unique_ratio : float
+        Convert string columns to ``category`` when the number of unique
+        values is at most this fraction of the rows (default ``0.5``).
+    downcast_float : bool
+        Also downcast float columns to ``float32`` (default ``False``).
+        This loses precision.
+    verbose : bool
+        Print memory usage in bytes before and after (default ``False``).
 
     Returns
     -------
     pandas.DataFrame
+        Copy of *df* with optimised column dtypes.
     """
-    atomic_cols = []
-    for col in df.columns:
-        sample = df[col].dropna()
-        if len(sample) == 0:
-            atomic_cols.append(col)
+    try:
+        import pyarrow  # noqa: F401, PLC0415
+    except ImportError:
+        arrow_string: pd.StringDtype | None = None
+    else:
+        # NaN as the missing value, as for the default ``str`` dtype.
+        arrow_string = pd.StringDtype("pyarrow", na_value=np.nan)
+    out = df.copy(deep=False)
+    for i, dtype in enumerate(df.dtypes):
+        col = df.iloc[:, i]
+        if pd.api.types.is_bool_dtype(dtype) or isinstance(dtype, pd.CategoricalDtype):
             continue
-        first = sample.iloc[0]
-        if not isinstance(first, (list, dict, set, np.ndarray)):
-            atomic_cols.append(col)
-    return df.loc[:, atomic_cols]
+        if pd.api.types.is_integer_dtype(dtype):
+            out.isetitem(i, pd.to_numeric(col, downcast="integer"))
+        elif pd.api.types.is_float_dtype(dtype):
+            if downcast_float:
+                out.isetitem(i, pd.to_numeric(col, downcast="float"))
+        elif pd.api.types.is_string_dtype(dtype):
+            if pd.api.types.infer_dtype(col, skipna=True) not in ("string", "empty"):
+                continue
+            if col.nunique() <= max_unique_ratio * len(col):
+                out.isetitem(i, col.astype("category"))
+            elif arrow_string is not None and getattr(dtype, "storage", None) != "pyarrow":
+                out.isetitem(i, col.astype(arrow_string))
+    if verbose:
+        before = int(df.memory_usage(deep=True).sum())
+        after = int(out.memory_usage(deep=True).sum())
+        print(f"Memory usage: {before:,} -> {after:,} bytes ({after / max(before, 1):.1%}).")
+    return out
 
 
-def match_all(x: Sequence, table: Sequence) -> list[int]:
+def match_all(
+    x: Sequence | _ArrayLike,
+    table: Sequence | _ArrayLike,
+    *,
+    nomatch: int | Literal["mask"] | None = None,
+) -> list[int] | np.ndarray | tuple[list[int] | np.ndarray, list[bool] | np.ndarray]:
     """Return indices of all matches of *x* in *table*.
 
     Like R's ``match()`` but returns *all* positions, not just the
@@ -120,37 +508,222 @@ def match_all(x: Sequence, table: Sequence) -> list[int]:
 
     Parameters
     ----------
-    x : sequence
+    x : sequence, numpy.ndarray, pandas.Series, or pandas.Index
         Values to look up.
-    table : sequence
+    table : sequence, numpy.ndarray, pandas.Series, or pandas.Index
         Reference table.
+    nomatch : int, 'mask', or None
+        Handling of values not found in *table*. ``None`` (default)
+        raises :class:`KeyError`. An integer sentinel (e.g. ``-1``) is
+        emitted once in place of each missing value. ``'mask'`` skips
+        missing values and also returns a Boolean mask of the queries
+        that were found.
 
     Returns
     -------
-    list[int]
-        0-based indices into *table*.
+    list[int] or numpy.ndarray, or tuple
+        0-based indices into *table*, concatenated in query order: a list
+        when *x* is a plain sequence, an array otherwise. With
+        ``nomatch='mask'``, an ``(indices, found)`` tuple.
 
     Raises
     ------
     KeyError
-        If any element in *x* is not found in *table*.
-    """
-    lookup: dict[Any, list[int]] = {}
-    for i, val in enumerate(table):
-        lookup.setdefault(val, []).append(i)
-    result: list[int] = []
-    for val in x:
-        if val not in lookup:
+        If any element in *x* is not found in *table* and *nomatch* is
+        ``None``.
+
+    See Also
+    --------
+    MatchIndex : Reusable lookup for repeated queries against one table.
+    """
+    result = MatchIndex(table).match_all(x, nomatch=nomatch)
+    if isinstance(x, _ArrayLike):
+        return result
+    if isinstance(result, tuple):
+        return result[0].tolist(), result[1].tolist()
+    return result.tolist()
+
+
+class MatchIndex:
+    """Reusable lookup of value positions in a reference table.
+
+    The table is factorised once into compressed sparse row (CSR) form:
+    the positions of every distinct value are stored contiguously in
+    :attr:`positions`, delimited by :attr:`offsets`. Lookups are then
+    vectorised over NumPy arrays of queries.
+
+    Parameters
+    ----------
+    table : sequence, numpy.ndarray, pandas.Series, or pandas.Index
+        Reference table.
+
+    Attributes
+    ----------
+    values : pandas.Index
+        Distinct values of the table, in order of first appearance.
+    offsets : numpy.ndarray
+        Start of each value's positions; ``offsets[i + 1] - offsets[i]``
+        is the number of occurrences of ``values[i]``.
+    positions : numpy.ndarray
+        0-based table positions, grouped by value and ascending within
+        each group.
+    """
+
+    def __init__(self, table: Sequence | _ArrayLike) -> None:
+        codes, uniques = pd.factorize(
+            table if isinstance(table, _ArrayLike) else pd.Series(list(table)),
+            use_na_sentinel=False,
+        )
+        self.values: pd.Index = pd.Index(uniques)
+        self.offsets: np.ndarray = np.zeros(len(uniques) + 1, dtype=np.intp)
+        np.cumsum(np.bincount(codes, minlength=len(uniques)), out=self.offsets[1:])
+        self.positions: np.ndarray = np.argsort(codes, kind="stable").astype(np.intp)
+
+    def __len__(self) -> int:
+        return len(self.positions)
+
+    def _lookup(
+        self,
+        x: Sequence | _ArrayLike,
+        *,
+        nomatch: int | Literal["mask"] | None,
+    ) -> tuple[np.ndarray, np.ndarray]:
+        """Return the value code of each query and a mask of found queries."""
+        if nomatch is not None and nomatch != "mask" and not isinstance(nomatch, int):
+            raise ValueError(f"Unsupported nomatch {nomatch!r}. Use an int, 'mask', or None.")
+        codes = self.values.get_indexer(x if isinstance(x, _ArrayLike) else list(x))
+        found = codes >= 0
+        if nomatch is None and not found.all():
+            val = np.asarray(x, dtype=object)[np.argmin(found)]
             raise KeyError(f"{val!r} not found in table")
-        result.extend(lookup[val])
-    return result
+        return codes, found
+
+    def match_first(
+        self,
+        x: Sequence | _ArrayLike,
+        *,
+        nomatch: int | Literal["mask"] | None = None,
+    ) -> np.ndarray | tuple[np.ndarray, np.ndarray]:
+        """Return the first position of each query in the table.
+
+        Parameters
+        ----------
+        x : sequence, numpy.ndarray, pandas.Series, or pandas.Index
+            Values to look up.
+        nomatch : int, 'mask', or None
+            Handling of missing values, as for :func:`match_all`.
+
+        Returns
+        -------
+        numpy.ndarray or tuple
+            0-based indices into the table, one per query. With
+            ``nomatch='mask'``, an ``(indices, found)`` tuple where
+            indices cover found queries only.
+
+        Raises
+        ------
+        KeyError
+            If any element in *x* is not found in the table and
+            *nomatch* is ``None``.
+        """
+        codes, found = self._lookup(x, nomatch=nomatch)
+        if nomatch is None:
+            return self.positions[self.offsets[codes]]
+        first = self.positions[self.offsets[codes[found]]]
+        if nomatch == "mask":
+            return first, found
+        out = np.full(len(codes), nomatch, dtype=np.intp)
+        out[found] = first
+        return out
+
+    def match_all(
+        self,
+        x: Sequence | _ArrayLike,
+        *,
+        nomatch: int | Literal["mask"] | None = None,
+    ) -> np.ndarray | tuple[np.ndarray, np.ndarray]:
+        """Return all positions of each query in the table.
+
+        Parameters
+        ----------
+        x : sequence, numpy.ndarray, pandas.Series, or pandas.Index
+            Values to look up.
+        nomatch : int, 'mask', or None
+            Handling of missing values, as for :func:`match_all`.
+
+        Returns
+        -------
+        numpy.ndarray or tuple
+            0-based indices into the table, concatenated in query order,
+            as for :func:`match_all`.
+
+        Raises
+        ------
+        KeyError
+            If any element in *x* is not found in the table and
+            *nomatch* is ``None``.
+        """
+        codes, found = self._lookup(x, nomatch=nomatch)
+        hit = codes[found]
+        # Missing queries take one output slot for a sentinel, none for a mask.
+        lengths = np.full(len(codes), 0 if nomatch == "mask" else 1, dtype=np.intp)
+        lengths[found] = self.offsets[hit + 1] - self.offsets[hit]
+        starts = np.zeros(len(codes), dtype=np.intp)
+        starts[found] = self.offsets[hit]
+        # Shift each run so that a single arange walks every run in turn.
+        shift = starts - (np.cumsum(lengths) - lengths)
+        gather = np.repeat(shift, lengths) + np.arange(lengths.sum())
+        if nomatch is None:
+            return self.positions[gather]
+        if nomatch == "mask":
+            return self.positions[gather], found
+        out = np.full(len(gather), nomatch, dtype=np.intp)
+        hits = np.repeat(found, lengths)
+        out[hits] = self.positions[gather[hits]]
+        return out
+
+
+def _nested_children(obj: object) -> Iterator[tuple[Any, Any, Hashable]]:
+    """Yield ``(key, value, step)`` for each child of a dict or list node.
+
+    Dict entries match on their key and list items on themselves; *step*
+    is the dict key or list index used to build the path.
+    """
+    if isinstance(obj, dict):
+        return ((key, value, key) for key, value in obj.items())
+    if isinstance(obj, (list, tuple)):
+        return ((item, item, i) for i, item in enumerate(obj))
+    return iter(())
+
+
+def _walk_nested(table: dict | list) -> Iterator[tuple[tuple, Any, Any]]:
+    """Iteratively walk a nested dict/list structure in depth-first order.
+
+    Yields ``(path, key, value)`` for every dict entry and list item,
+    visiting children immediately after their parent, without recursion.
+    """
+    stack: list[tuple[tuple, Iterator]] = [((), _nested_children(table))]
+    while stack:
+        path, children = stack[-1]
+        child = next(children, None)
+        if child is None:
+            stack.pop()
+            continue
+        key, value, step = child
+        child_path = (*path, step)
+        yield child_path, key, value
+        if isinstance(value, (dict, list, tuple)):
+            stack.append((child_path, _nested_children(value)))
 
 
 def match_nested(
     x: Hashable,
     table: dict | list,
 ) -> Hashable | None:
-    """Recursively search for *x* in a nested dict/list structure.
+    """Search for *x* in a nested dict/list structure.
+
+    The structure is walked iteratively, so deeply nested input does not
+    hit the recursion limit.
 
     Parameters
     ----------
@@ -162,50 +735,170 @@ def match_nested(
     Returns
     -------
     object or None
-        The matched value, or ``None`` if not found.
-    """
-    if isinstance(table, dict):
-        for key, value in table.items():
-            if key == x:
-                return value
-            found = match_nested(x, value)
-            if found is not None:
-                return found
-    elif isinstance(table, (list, tuple)):
-        for item in table:
-            if item == x:
-                return item
-            found = match_nested(x, item)
-            if found is not None:
-                return found
+        The value of the first match in depth-first order (which may
+        itself be ``None``), or ``None`` if not found.
+
+    See Also
+    --------
+    NestedIndex : Reusable index for repeated queries against one structure.
+    """
+    for _, key, value in _walk_nested(table):
+        if key == x:
+            return value
     return None
 
 
+class NestedIndex:
+    """Flattened index of a nested dict/list structure.
+
+    The structure is walked once, iteratively, into a mapping of every
+    dict key and (hashable) list item to the paths and values where it
+    occurs. Lookups are then constant time.
+
+    Parameters
+    ----------
+    table : dict or list
+        Nested structure.
+    """
+
+    def __init__(self, table: dict | list) -> None:
+        self._index: dict[Hashable, list[tuple[tuple, Any]]] = {}
+        for path, key, value in _walk_nested(table):
+            try:
+                self._index.setdefault(key, []).append((path, value))
+            except TypeError:
+                # Unhashable list items (e.g. nested dicts) are not keys.
+                continue
+
+    def __contains__(self, x: object) -> bool:
+        try:
+            return x in self._index
+        except TypeError:
+            return False
+
+    def __len__(self) -> int:
+        return len(self._index)
+
+    def get(self, x: Hashable, default: Any = None) -> Any:  # noqa: ANN401
+        """Return the first value matching *x*, as for :func:`match_nested`.
+
+        Parameters
+        ----------
+        x : object
+            Value to search for.
+        default : object
+            Returned when *x* is not found (default ``None``).
+
+        Returns
+        -------
+        object
+            The value of the first match, or *default* if *x* is not
+            found or is unhashable.
+        """
+        try:
+            matches = self._index.get(x)
+        except TypeError:
+            return default
+        return matches[0][1] if matches else default
+
+    def find_all(self, x: Hashable) -> list[tuple[tuple, Any]]:
+        """Return every match of *x* with its path.
+
+        Parameters
+        ----------
+        x : object
+            Value to search for.
+
+        Returns
+        -------
+        list[tuple]
+            ``(path, value)`` pairs in depth-first order, where *path* is
+            a tuple of dict keys and list indices from the root. Empty if
+            *x* is not found or is unhashable.
+        """
+        try:
+            return list(self._index.get(x, ()))
+        except TypeError:
+            return []
+
+
+_tail_block_size: int = 64 * 1024
+"""Bytes read per backward step when reading the tail of a file."""
+
+
+def _file_headtail(path: str | os.PathLike, n: int) -> list[str]:
+    """Return the first and last *n* lines of a text file.
+
+    Uncompressed files are read from the start for the head and backwards
+    from the end for the tail. Compressed files are streamed once,
+    keeping only the last *n* lines in memory.
+    """
+    suffix = Path(path).suffix.lower()
+    codec = next((k for k, (ext, _) in _codecs.items() if ext == suffix), None)
+    if codec is not None:
+        with _codec_open(path, "rb", codec=codec) as f:
+            raw = list(islice(f, n))
+            tail = deque(raw, maxlen=n)
+            tail.extend(f)
+            raw.extend(tail)
+    else:
+        with open(path, "rb") as f:
+            raw = list(islice(f, n))
+            f.seek(0, os.SEEK_END)
+            pos = f.tell()
+            block = b""
+            # Read backwards until the block holds n complete lines.
+            while pos > 0 and block.count(b"\n") <= n:
+                step = min(_tail_block_size, pos)
+                pos -= step
+                f.seek(pos)
+                block = f.read(step) + block
+            raw.extend(block.splitlines(keepends=True)[-n:] if n > 0 else [])
+    return [line.decode("utf-8").rstrip("\r\n") for line in raw]
+
+
 def headtail(
-    x: pd.DataFrame | list | np.ndarray,
+    x: pd.DataFrame | np.ndarray | Iterable | str | os.PathLike,
     n: int = 2,
+    *,
+    verbose: bool = True,
 ) -> pd.DataFrame | list | np.ndarray:
     """Return (and print) the first and last *n* elements / rows.
 
+    Only the head and tail are materialised: sequences are sliced,
+    iterators are consumed keeping at most *n* trailing elements, and
+    files are read line by line.
+
     Parameters
     ----------
-    x : DataFrame, list, or array
+    x : DataFrame, array, iterable, or path
+        A path to an existing file returns its first and last *n* lines.
+        Files compressed with gzip, bzip2, or xz are streamed.
     n : int
+    verbose : bool
+        Print the result (default ``True``). Set to ``False`` when
+        calling inside pipelines.
 
     Returns
     -------
     DataFrame, list, or numpy.ndarray
-        Combined head+tail of ``x``, matching the input type.
+        Combined head+tail of ``x``, matching the input type. Files and
+        other iterables return a list.
     """
     if isinstance(x, pd.DataFrame):
         out = pd.concat([x.head(n), x.tail(n)])
-        print(out)
-        return out
-    if isinstance(x, np.ndarray):
+    elif isinstance(x, np.ndarray):
         out = np.concatenate([x[:n], x[-n:]])
+    elif isinstance(x, (str, os.PathLike)) and os.path.isfile(x):
+        out = _file_headtail(x, n)
+    elif isinstance(x, (Sequence, pd.Series, pd.Index)):
+        out = list(x[:n]) + list(x[-n:])
+    else:
+        it = iter(x)
+        out = list(islice(it, n))
+        tail = deque(out, maxlen=n)
+        tail.extend(it)
+        out.extend(tail)
+    if verbose:
         print(out)
-        return out
-    seq = list(x)
-    out = seq[:n] + seq[-n:]
-    print(out)
     return out
@@ -1,37 +1,285 @@
 """Mathematical / statistical helper functions."""
 
+from __future__ import annotations
+
+import contextlib
+import multiprocessing
+from collections.abc import Callable, Iterator
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+from multiprocessing.shared_memory import SharedMemory
+
 import numpy as np
 import pandas as pd
+import scipy.sparse
+import scipy.sparse.linalg
+import scipy.spatial
+
+from acidbase._system import cpus
+
+
+def _as_float(x: object, dtype: np.dtype | type | None = None) -> np.ndarray:
+    """Return *x* as a floating-point array, without copying if possible.
+
+    Floating-point input keeps its precision (e.g. ``float32``) unless
+    *dtype* is given; other input becomes ``float64``.
+    """
+    if dtype is None:
+        arr = np.asarray(x)
+        dtype = arr.dtype if np.issubdtype(arr.dtype, np.floating) else np.float64
+        return arr.astype(dtype, copy=False)
+    return np.asarray(x, dtype=dtype)
+
 
+def _check_out(out: object) -> None:
+    """Raise :class:`TypeError` unless *out* is ``None`` or a NumPy array.
 
-def euclidean(a: np.ndarray, b: np.ndarray) -> float:
+    Pandas objects are rejected: their arrays are read-only views under
+    copy-on-write, so they cannot be written in place.
+    """
+    if out is not None and not isinstance(out, np.ndarray):
+        raise TypeError(f"out must be a numpy.ndarray, not {type(out).__name__}.")
+
+
+def _like(values: np.ndarray, x: object) -> pd.Series | pd.DataFrame | np.ndarray:
+    """Wrap *values* with the labels of *x* if it is a pandas object, without copying."""
+    if isinstance(x, pd.Series):
+        return pd.Series(values, index=x.index, name=x.name, copy=False)
+    if isinstance(x, pd.DataFrame):
+        return pd.DataFrame(values, index=x.index, columns=x.columns, copy=False)
+    return values
+
+
+def euclidean(
+    a: np.ndarray,
+    b: np.ndarray,
+    *,
+    dtype: np.dtype | type | None = None,
+) -> float:
     """Compute the Euclidean distance between two vectors.
 
     Parameters
     ----------
     a, b : array-like
+    dtype : numpy.dtype, optional
+        Floating-point type for the computation. By default, the input
+        precision is kept (``float64`` for non-float input).
 
     Returns
     -------
     float
     """
-    a = np.asarray(a, dtype=float)
-    b = np.asarray(b, dtype=float)
-    return float(np.sqrt(np.sum((a - b) ** 2)))
+    diff = np.subtract(_as_float(a, dtype), _as_float(b, dtype), dtype=dtype).ravel()
+    return float(np.sqrt(np.dot(diff, diff)))
 
 
-def geometric_mean(
+def _euclidean_block(
+    x: np.ndarray,
+    y: np.ndarray,
+    *,
+    xx: np.ndarray,
+    yy: np.ndarray,
+) -> np.ndarray:
+    """Return Euclidean distances between rows of *x* and *y*.
+
+    Uses ``|a|^2 + |b|^2 - 2ab`` so that the bulk of the work is one BLAS
+    matrix product; *xx* and *yy* are the squared row norms.
+    """
+    dist = x @ y.T
+    dist *= -2
+    dist += xx[:, None]
+    dist += yy[None, :]
+    np.maximum(dist, 0, out=dist)
+    return np.sqrt(dist, out=dist)
+
+
+def pairwise_euclidean(
+    x: np.ndarray,
+    y: np.ndarray | None = None,
+    *,
+    block_size: int = 1024,
+    workers: int = 1,
+    condensed: bool = False,
+    out: np.ndarray | None = None,
+) -> np.ndarray:
+    """Compute Euclidean distances between all pairs of rows.
+
+    The matrix is built in blocks of rows (and columns), each computed
+    as a single BLAS matrix product, optionally on a thread pool.
+
+    Parameters
+    ----------
+    x : array-like
+        2-D array with one observation per row.
+    y : array-like, optional
+        Second 2-D array. By default, distances within *x* are computed.
+    block_size : int
+        Number of rows (and columns) per block (default ``1024``).
+    workers : int
+        Maximum number of threads (default ``1``). Use ``0`` for all
+        available CPUs.
+    condensed : bool
+        Return the upper triangle as a condensed vector, as for
+        :func:`scipy.spatial.distance.pdist` (default ``False``). Only
+        valid when *y* is not given.
+    out : numpy.ndarray, optional
+        Array to write the result into, e.g. a writable
+        :class:`numpy.memmap` for matrices larger than memory.
+
+    Returns
+    -------
+    numpy.ndarray
+        Distance matrix of shape ``(len(x), len(y))``, or condensed
+        vector of length ``n * (n - 1) / 2``.
+    """
+    x = _as_float(x)
+    same = y is None
+    y = x if y is None else _as_float(y, x.dtype)
+    if condensed and not same:
+        raise ValueError("condensed=True requires y to be None.")
+    n, m = len(x), len(y)
+    xx = np.einsum("ij,ij->i", x, x)
+    yy = xx if same else np.einsum("ij,ij->i", y, y)
+    if out is None:
+        out = np.empty(n * (n - 1) // 2 if condensed else (n, m), dtype=x.dtype)
+
+    def full_block(i: int, j: int) -> None:
+        rows, cols = slice(i, i + block_size), slice(j, j + block_size)
+        out[rows, cols] = _euclidean_block(x[rows], y[cols], xx=xx[rows], yy=yy[cols])
+
+    def condensed_block(i: int) -> None:
+        # Rows i.. against columns i.. so that the strict upper triangle of
+        # the block, read row-major, is one contiguous run of the output.
+        stop = min(i + block_size, n)
+        dist = _euclidean_block(x[i:stop], x[i:], xx=xx[i:stop], yy=xx[i:])
+        upper = np.arange(n - i)[None, :] > np.arange(stop - i)[:, None]
+        start = i * n - i * (i + 1) // 2
+        out[start : start + int(upper.sum())] = dist[upper]
+
+    with ThreadPoolExecutor(max_workers=cpus(workers)) as pool:
+        if condensed:
+            futures = [pool.submit(condensed_block, i) for i in range(0, n, block_size)]
+        else:
+            futures = [
+                pool.submit(full_block, i, j)
+                for i in range(0, n, block_size)
+                for j in range(0, m, block_size)
+            ]
+        for future in futures:
+            future.result()
+    if same and not condensed:
+        np.fill_diagonal(out, 0)
+    return out
+
+
+_kdtree_max_dim: int = 16
+"""Highest dimensionality for which :func:`knn` uses a k-d tree."""
+
+
+def knn(
     x: np.ndarray,
+    k: int,
+    *,
+    metric: str = "euclidean",
+    block_size: int = 1024,
+    workers: int = 1,
+) -> tuple[np.ndarray, np.ndarray]:
+    """Find the *k* nearest neighbours of every row.
+
+    Low-dimensional data is searched with :class:`scipy.spatial.cKDTree`.
+    Otherwise distances are computed in blocks of rows, as for
+    :func:`pairwise_euclidean`, keeping only the nearest *k* of each row
+    with :func:`numpy.argpartition`, so memory is ``O(n * k)`` beyond
+    one block.
+
+    Parameters
+    ----------
+    x : array-like
+        2-D array with one observation per row.
+    k : int
+        Number of neighbours, excluding the row itself.
+    metric : str
+        Distance metric. Only ``'euclidean'`` is supported.
+    block_size : int
+        Number of rows per block (default ``1024``).
+    workers : int
+        Maximum number of threads (default ``1``). Use ``0`` for all
+        available CPUs.
+
+    Returns
+    -------
+    tuple of numpy.ndarray
+        ``(indices, distances)``, each of shape ``(n, k)`` and ordered by
+        increasing distance.
+    """
+    if metric != "euclidean":
+        raise ValueError(f"Unsupported metric {metric!r}. Use 'euclidean'.")
+    x = _as_float(x)
+    n = len(x)
+    if not 0 < k < n:
+        raise ValueError(f"k must be between 1 and {n - 1}.")
+    self_idx = np.arange(n)
+    if x.shape[1] <= _kdtree_max_dim:
+        tree = scipy.spatial.cKDTree(x)
+        dist, idx = tree.query(x, k=k + 1, workers=cpus(workers))
+        # Drop each row itself, or the farthest hit when duplicates hide it.
+        drop = idx == self_idx[:, None]
+        drop[~drop.any(axis=1), -1] = True
+        return idx[~drop].reshape(n, k), dist[~drop].reshape(n, k).astype(x.dtype)
+    xx = np.einsum("ij,ij->i", x, x)
+    indices = np.empty((n, k), dtype=np.intp)
+    distances = np.empty((n, k), dtype=x.dtype)
+
+    def block(i: int) -> None:
+        rows = slice(i, i + block_size)
+        dist = _euclidean_block(x[rows], x, xx=xx[rows], yy=xx)
+        dist[np.arange(len(dist)), self_idx[rows]] = np.inf
+        part = np.argpartition(dist, k - 1, axis=1)[:, :k]
+        part_dist = np.take_along_axis(dist, part, axis=1)
+        order = np.argsort(part_dist, axis=1)
+        indices[rows] = np.take_along_axis(part, order, axis=1)
+        distances[rows] = np.take_along_axis(part_dist, order, axis=1)
+
+    with ThreadPoolExecutor(max_workers=cpus(workers)) as pool:
+        for future in [pool.submit(block, i) for i in range(0, n, block_size)]:
+            future.result()
+    return indices, distances
+
+
+def _reduce(
+    x: np.ndarray | scipy.sparse.sparray | scipy.sparse.spmatrix,
+    values: np.ndarray,
+    *,
+    axis: int | None,
+) -> np.ndarray:
+    """Sum *values* along *axis*, where *values* align with the entries of *x*.
+
+    For sparse *x*, *values* align with the stored entries (``x.data``)
+    and implicit zeros contribute nothing.
+    """
+    if scipy.sparse.issparse(x):
+        values = type(x)((values, x.indices, x.indptr), shape=x.shape)
+    return np.asarray(values.sum(axis=axis)).ravel()
+
+
+def geometric_mean(
+    x: np.ndarray | scipy.sparse.sparray | scipy.sparse.spmatrix,
     *,
+    axis: int | None = None,
     remove_na: bool = True,
     zero_propagate: bool = False,
-) -> float:
+    workers: int | None = None,
+    engine: str = "threads",
+) -> float | np.ndarray:
     """Compute the geometric mean.
 
     Parameters
     ----------
-    x : array-like
-        Numeric vector.
+    x : array-like or scipy.sparse matrix
+        Numeric vector or matrix. For sparse input, implicit zeros are
+        counted without densifying.
+    axis : int, optional
+        Axis along which to compute, e.g. ``1`` for per-row (per-gene)
+        means of a matrix. By default, all values are used.
     remove_na : bool
         If ``True`` (default), ``NA``/``NaN`` values are removed before
         computing.
@@ -40,80 +288,610 @@ def geometric_mean(
         If ``False`` (default), zeros are excluded before computing, but the
         full length of ``x`` (including zeros) is used as the denominator —
         matching R's ``geometricMean`` default.
+    workers : int, optional
+        Maximum number of threads or processes computing blocks of the
+        result in parallel. By default, one thread, or every available
+        CPU with ``engine='processes'``. Use ``0`` for all available
+        CPUs. Parallel computation needs dense input and *axis*; a
+        vector, or a single block of work, is computed directly.
+    engine : str
+        ``'threads'`` (default) or ``'processes'``, which share the
+        input and result through :mod:`multiprocessing.shared_memory`.
 
     Returns
     -------
-    float
+    float or numpy.ndarray
+        A float when *axis* is ``None`` or *x* is a vector, otherwise
+        an array with one value per slice along *axis*.
 
     Notes
     -----
     Returns ``NaN`` when any element is negative (R semantics).
     """
-    x = np.asarray(x, dtype=float)
-    if remove_na:
-        x = x[~np.isnan(x)]
-    if len(x) == 0:
-        return float("nan")
-    # Any negative value → NaN (matches R)
-    if np.any(x < 0):
-        return float("nan")
+    _check_engine(engine)
+    if (workers not in (None, 1) or engine != "threads") and np.ndim(x) != 1:
+        if axis not in (0, 1) or scipy.sparse.issparse(x):
+            raise ValueError("Parallel geometric means need dense input and an axis of 0 or 1.")
+        x = np.asarray(x, dtype=float)
+        out = np.empty(x.shape[1 - axis])
+        _run_blocks(
+            _geometric_mean_kernel,
+            x,
+            out=out,
+            n_items=len(out),
+            engine=engine,
+            workers=workers,
+            axis=axis,
+            remove_na=remove_na,
+            zero_propagate=zero_propagate,
+        )
+        return out
+    if scipy.sparse.issparse(x):
+        x = x.tocsr() if x.format not in ("csr", "csc") else x
+        if not x.has_canonical_format:
+            x = x.copy()
+            x.sum_duplicates()
+        data = x.data.astype(float, copy=False)
+        ones = np.ones(len(data))
+        total = x.shape[axis] if axis is not None else np.prod(x.shape)
+        zero = (
+            total - _reduce(x, ones, axis=axis) + _reduce(x, (data == 0).astype(float), axis=axis)
+        )
+    else:
+        x = np.asarray(x, dtype=float)
+        data = x
+        total = x.shape[axis] if axis is not None else x.size
+        zero = _reduce(x, data == 0, axis=axis)
+    n_na = _reduce(x, np.isnan(data), axis=axis)
+    n_neg = _reduce(x, data < 0, axis=axis)
+    positive = data > 0
+    log_sum = _reduce(x, np.log(data, out=np.zeros_like(data), where=positive), axis=axis)
+    result = _geometric_mean_from_sums(
+        log_sum,
+        total=total,
+        n_na=n_na,
+        n_neg=n_neg,
+        zero=zero,
+        remove_na=remove_na,
+        zero_propagate=zero_propagate,
+    )
+    return float(result[0]) if axis is None or np.ndim(x) == 1 else result
+
+
+def _geometric_mean_from_sums(
+    log_sum: np.ndarray,
+    *,
+    total: int | np.ndarray,
+    n_na: np.ndarray,
+    n_neg: np.ndarray,
+    zero: np.ndarray,
+    remove_na: bool,
+    zero_propagate: bool,
+) -> np.ndarray:
+    """Finish a geometric mean from sums of logs and counts of special values."""
+    # Divide by FULL length (including excluded zeros), not the number of positives.
+    n = total - n_na if remove_na else np.broadcast_to(total, log_sum.shape).astype(float)
+    with np.errstate(divide="ignore", invalid="ignore"):
+        result = np.exp(log_sum / n)
     if zero_propagate:
-        if np.any(x == 0):
-            return 0.0
-        return float(np.exp(np.mean(np.log(x))))
-    # Divide by FULL length (including excluded zeros), not len(positives)
-    n = len(x)
-    log_sum = np.sum(np.log(x[x > 0]))
-    return float(np.exp(log_sum / n))
+        if not remove_na:
+            result[n_na > 0] = np.nan
+        result[zero > 0] = 0.0
+    # Any negative value → NaN (matches R)
+    result[(n_neg > 0) | (n == 0)] = np.nan
+    return result
+
+
+def _group_rows(groups: object, n_rows: int) -> tuple[pd.Index, np.ndarray, np.ndarray, np.ndarray]:
+    """Factorise row labels once for grouped reductions.
+
+    Returns the sorted group labels, the row order that makes each group
+    contiguous (rows with missing labels are dropped), the start of each
+    group in that order (for :func:`numpy.add.reduceat`), and group sizes.
+    """
+    codes, labels = pd.factorize(np.asarray(groups), sort=True)
+    if len(codes) != n_rows:
+        raise ValueError(f"Expected {n_rows} group labels, got {len(codes)}.")
+    order = np.argsort(codes, kind="stable")
+    order = order[codes[order] >= 0]
+    counts = np.bincount(codes[order], minlength=len(labels))
+    # Empty when every label is missing, giving empty reductions.
+    starts = np.r_[0, np.cumsum(counts)][:-1]
+    return pd.Index(labels), order, starts, counts
+
+
+def _grouped_result(
+    result: np.ndarray,
+    x: pd.Series | pd.DataFrame | np.ndarray,
+    *,
+    index: pd.Index,
+) -> pd.Series | pd.DataFrame | np.ndarray:
+    """Label the rows of *result* by group when *x* is a pandas object."""
+    if isinstance(x, pd.Series):
+        return pd.Series(result, index=index, name=x.name)
+    if isinstance(x, pd.DataFrame):
+        return pd.DataFrame(result, index=index, columns=x.columns)
+    return result
+
+
+def grouped_geometric_mean(
+    x: pd.Series | pd.DataFrame | np.ndarray,
+    groups: object,
+    *,
+    remove_na: bool = True,
+    zero_propagate: bool = False,
+) -> pd.Series | pd.DataFrame | np.ndarray:
+    """Compute column-wise geometric means within groups of rows.
+
+    Equivalent to ``df.groupby(groups).apply(geometric_mean, axis=0)``,
+    but every group is reduced in one vectorised pass.
+
+    Parameters
+    ----------
+    x : pandas.Series, pandas.DataFrame, or numpy.ndarray
+        Numeric vector or 2-D array with one row per observation, e.g.
+        samples by genes.
+    groups : array-like
+        Group label of every row. Rows with a missing label are ignored.
+    remove_na, zero_propagate : bool
+        As for :func:`geometric_mean`.
+
+    Returns
+    -------
+    pandas.Series, pandas.DataFrame, or numpy.ndarray
+        Groups by features. Groups are in sorted label order; pandas
+        results are indexed by the group labels.
+    """
+    values = np.asarray(x, dtype=float)
+    labels, order, starts, counts = _group_rows(groups, len(values))
+    values = values[order]
+    total = counts.reshape((-1,) + (1,) * (values.ndim - 1))
+
+    def group_sum(v: np.ndarray) -> np.ndarray:
+        return np.add.reduceat(v, starts, axis=0, dtype=np.float64)
+
+    positive = values > 0
+    result = _geometric_mean_from_sums(
+        group_sum(np.log(values, out=np.zeros_like(values), where=positive)),
+        total=total,
+        n_na=group_sum(np.isnan(values)),
+        n_neg=group_sum(values < 0),
+        zero=group_sum(values == 0),
+        remove_na=remove_na,
+        zero_propagate=zero_propagate,
+    )
+    return _grouped_result(result, x, index=labels)
+
+
+def _grouped_moments(
+    values: np.ndarray,
+    groups: object,
+) -> tuple[pd.Index, np.ndarray, np.ndarray, np.ndarray, np.ndarray]:
+    """Return group labels, means, standard deviations, and sizes, and row codes.
+
+    Standard deviations use ``ddof=1``. Row codes index the groups and
+    are ``-1`` for rows with a missing label.
+    """
+    labels, order, starts, counts = _group_rows(groups, len(values))
+    n = counts.reshape((-1,) + (1,) * (values.ndim - 1))
+    sorted_values = values[order]
+    mean = np.add.reduceat(sorted_values, starts, axis=0) / n
+    # Two passes (sum, then squared deviations) for numerical stability.
+    sorted_values -= np.repeat(mean, counts, axis=0)
+    np.square(sorted_values, out=sorted_values)
+    with np.errstate(divide="ignore", invalid="ignore"):
+        std = np.sqrt(np.add.reduceat(sorted_values, starts, axis=0) / (n - 1))
+    codes = np.full(len(values), -1, dtype=np.intp)
+    codes[order] = np.repeat(np.arange(len(labels)), counts)
+    return labels, mean, std, counts, codes
+
+
+def grouped_sem(
+    x: pd.Series | pd.DataFrame | np.ndarray,
+    groups: object,
+) -> pd.Series | pd.DataFrame | np.ndarray:
+    """Compute column-wise standard errors of the mean within groups of rows.
+
+    Parameters
+    ----------
+    x : pandas.Series, pandas.DataFrame, or numpy.ndarray
+        Numeric vector or 2-D array with one row per observation.
+    groups : array-like
+        Group label of every row. Rows with a missing label are ignored.
+
+    Returns
+    -------
+    pandas.Series, pandas.DataFrame, or numpy.ndarray
+        Groups by features, as for :func:`grouped_geometric_mean`.
+    """
+    values = np.asarray(x, dtype=float)
+    labels, _, std, counts, _ = _grouped_moments(values, groups)
+    result = std / np.sqrt(counts).reshape((-1,) + (1,) * (values.ndim - 1))
+    return _grouped_result(result, x, index=labels)
+
+
+def grouped_zscore(
+    x: pd.Series | pd.DataFrame | np.ndarray,
+    groups: object,
+    *,
+    center: bool = True,
+) -> pd.Series | pd.DataFrame | np.ndarray:
+    """Compute column-wise Z-scores within groups of rows.
+
+    Parameters
+    ----------
+    x : pandas.Series, pandas.DataFrame, or numpy.ndarray
+        Numeric vector or 2-D array with one row per observation.
+    groups : array-like
+        Group label of every row. Rows with a missing label get ``NaN``.
+    center : bool
+        Subtract the group mean (default ``True``).
+
+    Returns
+    -------
+    pandas.Series, pandas.DataFrame, or numpy.ndarray
+        Z-scores of the same shape and type as *x*, preserving pandas
+        labels.
+    """
+    values = np.asarray(x, dtype=float)
+    _, mean, std, _, codes = _grouped_moments(values, groups)
+    keep = codes >= 0
+    out = np.full_like(values, np.nan)
+    centered = values[keep] - mean[codes[keep]] if center else values[keep]
+    out[keep] = centered / std[codes[keep]]
+    return _like(out, x)
+
+
+class RunningStats:
+    """Streaming mean and variance accumulator.
 
+    Consumes chunks of rows with Welford-style updates and merges
+    accumulators from separate workers with Chan's parallel formula, so
+    statistics of data larger than memory are computed in one pass.
 
-def sem(x: np.ndarray) -> float:
+    Parameters
+    ----------
+    shape : tuple of int
+        Shape of one row, e.g. ``()`` for a stream of scalars (default)
+        or ``(n_cols,)`` for column-wise statistics of a matrix.
+
+    Attributes
+    ----------
+    count : int
+        Number of rows seen.
+    mean : numpy.ndarray
+        Running mean of each column.
+    m2 : numpy.ndarray
+        Running sum of squared deviations from the mean.
+
+    Examples
+    --------
+    >>> stats = RunningStats((3,))
+    >>> for chunk in chunks:  # doctest: +SKIP
+    ...     stats.update(chunk)
+    >>> stats.std()  # doctest: +SKIP
+    """
+
+    def __init__(self, shape: tuple[int, ...] = ()) -> None:
+        self.count: int = 0
+        self.mean: np.ndarray = np.zeros(shape)
+        self.m2: np.ndarray = np.zeros(shape)
+
+    def _combine(self, count: int, *, mean: np.ndarray, m2: np.ndarray) -> None:
+        """Merge another set of moments into this accumulator (Chan et al.)."""
+        if count == 0:
+            return
+        total = self.count + count
+        delta = mean - self.mean
+        self.mean = self.mean + delta * (count / total)
+        self.m2 = self.m2 + m2 + delta**2 * (self.count * count / total)
+        self.count = total
+
+    def update(self, chunk: np.ndarray) -> RunningStats:
+        """Add a chunk of rows.
+
+        Parameters
+        ----------
+        chunk : array-like
+            Array whose first axis indexes rows and whose remaining shape
+            matches the accumulator.
+
+        Returns
+        -------
+        RunningStats
+            The updated accumulator, for chaining.
+        """
+        chunk = np.asarray(chunk, dtype=float)
+        if len(chunk) == 0:
+            return self
+        mean = chunk.mean(axis=0)
+        m2 = ((chunk - mean) ** 2).sum(axis=0)
+        self._combine(len(chunk), mean=mean, m2=m2)
+        return self
+
+    def merge(self, other: RunningStats) -> RunningStats:
+        """Merge the statistics of another accumulator, e.g. from a worker.
+
+        Parameters
+        ----------
+        other : RunningStats
+
+        Returns
+        -------
+        RunningStats
+            The updated accumulator, for chaining.
+        """
+        self._combine(other.count, mean=other.mean, m2=other.m2)
+        return self
+
+    def var(self, ddof: int = 1) -> np.ndarray:
+        """Return the variance.
+
+        Parameters
+        ----------
+        ddof : int
+            Delta degrees of freedom (default ``1``).
+
+        Returns
+        -------
+        numpy.ndarray
+        """
+        with np.errstate(divide="ignore", invalid="ignore"):
+            return self.m2 / (self.count - ddof)
+
+    def std(self, ddof: int = 1) -> np.ndarray:
+        """Return the standard deviation.
+
+        Parameters
+        ----------
+        ddof : int
+            Delta degrees of freedom (default ``1``).
+
+        Returns
+        -------
+        numpy.ndarray
+        """
+        return np.sqrt(self.var(ddof))
+
+
+def _iter_chunks(x: np.ndarray, chunksize: int) -> Iterator[tuple[int, int]]:
+    """Yield ``(start, stop)`` row ranges of at most *chunksize* rows."""
+    for start in range(0, len(x), chunksize):
+        yield start, min(start + chunksize, len(x))
+
+
+def sem(x: np.ndarray, *, chunksize: int | None = None) -> float:
     """Compute the standard error of the mean.
 
     Parameters
     ----------
     x : array-like
+        Input, e.g. a :class:`numpy.memmap` from
+        ``np.load(path, mmap_mode="r")``.
+    chunksize : int, optional
+        Stream *x* in chunks of this many rows with a
+        :class:`RunningStats` accumulator, so that memory use is bounded.
 
     Returns
     -------
     float
     """
+    if chunksize is not None:
+        stats = RunningStats()
+        for start, stop in _iter_chunks(x, chunksize):
+            stats.update(np.ravel(x[start:stop]))
+        return float(stats.std() / np.sqrt(len(x)))
     x = np.asarray(x, dtype=float)
     return float(np.std(x, ddof=1) / np.sqrt(len(x)))
 
 
-def zscore(x: np.ndarray) -> np.ndarray:
+class _SparseZScore(scipy.sparse.linalg.LinearOperator):
+    """Column-wise Z-scores of a sparse matrix, as a lazy linear operator.
+
+    Represents ``(x - mean) / std`` without densifying ``x``: products
+    are computed as ``x @ (v / std) - mean @ (v / std)``. Use
+    :meth:`block` to densify a range of rows on demand.
+
+    Parameters
+    ----------
+    x : scipy.sparse matrix
+    mean, std : numpy.ndarray
+        Column means and standard deviations.
+    """
+
+    def __init__(
+        self,
+        x: scipy.sparse.sparray,
+        *,
+        mean: np.ndarray,
+        std: np.ndarray,
+    ) -> None:
+        super().__init__(dtype=np.float64, shape=x.shape)
+        self.x = x
+        self.mean = mean
+        self.std = std
+
+    def _matmat(self, v: np.ndarray) -> np.ndarray:
+        v = v / self.std[:, None]
+        return self.x @ v - self.mean @ v
+
+    def _matvec(self, v: np.ndarray) -> np.ndarray:
+        return self._matmat(v.reshape(-1, 1)).ravel()
+
+    def _rmatmat(self, u: np.ndarray) -> np.ndarray:
+        return (self.x.T @ u - np.outer(self.mean, u.sum(axis=0))) / self.std[:, None]
+
+    def _rmatvec(self, u: np.ndarray) -> np.ndarray:
+        return self._rmatmat(u.reshape(-1, 1)).ravel()
+
+    def block(self, start: int, stop: int) -> np.ndarray:
+        """Return dense Z-scores for rows *start* to *stop*.
+
+        Parameters
+        ----------
+        start, stop : int
+            Row range, as for slicing.
+
+        Returns
+        -------
+        numpy.ndarray
+        """
+        rows = self.x[start:stop].toarray()
+        return (rows - self.mean) / self.std
+
+
+def _sparse_moments(x: scipy.sparse.sparray) -> tuple[np.ndarray, np.ndarray]:
+    """Return column means and standard deviations (``ddof=1``) of sparse *x*."""
+    n, n_cols = x.shape
+    if not x.has_canonical_format:
+        x = x.copy()
+        x.sum_duplicates()
+    # Column of every stored entry.
+    csr = x.format == "csr"
+    cols = x.indices if csr else np.repeat(np.arange(n_cols), np.diff(x.indptr))
+    data = x.data.astype(float, copy=False)
+    mean = np.bincount(cols, weights=data, minlength=n_cols) / n
+    # Two passes for numerical stability: squared deviations of the stored
+    # entries, plus those of the implicit zeros, which all equal mean**2.
+    deviation = data - mean[cols]
+    n_zeros = n - np.bincount(cols, minlength=n_cols)
+    ss = np.bincount(cols, weights=deviation * deviation, minlength=n_cols) + n_zeros * mean**2
+    return mean, np.sqrt(ss / (n - 1))
+
+
+def zscore(
+    x: np.ndarray | scipy.sparse.sparray | scipy.sparse.spmatrix,
+    *,
+    center: bool = True,
+    chunksize: int | None = None,
+    out: np.ndarray | None = None,
+    dtype: np.dtype | type | None = None,
+    workers: int | None = None,
+    engine: str = "threads",
+) -> np.ndarray | scipy.sparse.sparray | scipy.sparse.linalg.LinearOperator:
     """Compute Z-scores (column-wise for matrices).
 
     Parameters
     ----------
-    x : array-like
-        Numeric vector or 2-D array.
+    x : array-like or scipy.sparse matrix
+        Numeric vector or 2-D array. Sparse input is never densified:
+        column means and standard deviations are computed from sparse
+        moments.
+    center : bool
+        Subtract the mean (default ``True``). If ``False``, values are
+        only divided by the standard deviation, which keeps sparse input
+        sparse.
+    chunksize : int, optional
+        Process dense input in chunks of this many rows: one streaming
+        pass accumulates :class:`RunningStats`, and a second writes the
+        Z-scores chunk by chunk. Use with a memory-mapped *x*, e.g. from
+        ``np.load(path, mmap_mode="r")``, and *out* to bound memory.
+    out : numpy.ndarray, optional
+        Array (e.g. a writable :class:`numpy.memmap`) of the same shape
+        as *x* to write the result into. May be *x* itself to compute in
+        place. Not supported for sparse input.
+    dtype : numpy.dtype, optional
+        Floating-point type of the result. By default, the input
+        precision is kept (``float64`` for non-float input).
+    workers : int, optional
+        Maximum number of threads or processes standardising blocks of
+        columns in parallel. By default, one thread, or every available
+        CPU with ``engine='processes'``. Use ``0`` for all available
+        CPUs. Not supported with *chunksize* or sparse input.
+    engine : str
+        ``'threads'`` (default) or ``'processes'``, which share the
+        input and result through :mod:`multiprocessing.shared_memory`.
 
     Returns
     -------
-    numpy.ndarray
+    numpy.ndarray, scipy.sparse matrix, or scipy.sparse.linalg.LinearOperator
+        Dense input returns an array. Sparse input returns a sparse
+        matrix when ``center=False``, or otherwise a lazily centred
+        linear operator whose ``block(start, stop)`` method densifies a
+        range of rows on demand. If *out* is given, it is returned.
     """
-    x = np.asarray(x, dtype=float)
-    if x.ndim == 1:
-        return (x - np.mean(x)) / np.std(x, ddof=1)
-    return (x - x.mean(axis=0)) / x.std(axis=0, ddof=1)
+    if workers not in (None, 1) or engine != "threads":
+        if chunksize is not None or scipy.sparse.issparse(x):
+            raise ValueError("Parallel Z-scores need dense input without chunksize.")
+        x = _as_float(x, dtype)
+        if out is None:
+            out = np.empty_like(x)
+        matrix = x.reshape(x.shape[0], int(np.prod(x.shape[1:])))
+        result = out.reshape(matrix.shape)
+        _run_blocks(
+            _zscore_kernel,
+            matrix,
+            out=result,
+            n_items=matrix.shape[1],
+            engine=engine,
+            workers=workers,
+            center=center,
+        )
+        if not np.shares_memory(result, out):
+            out[...] = result.reshape(out.shape)
+        return out
+    if scipy.sparse.issparse(x):
+        x = x.tocsr() if x.format not in ("csr", "csc") else x
+        mean, std = _sparse_moments(x)
+        if center:
+            return _SparseZScore(x, mean=mean, std=std)
+        return type(x)(x.multiply(1.0 / std))
+    if chunksize is not None:
+        stats = RunningStats(np.shape(x)[1:])
+        for start, stop in _iter_chunks(x, chunksize):
+            stats.update(x[start:stop])
+        mean, std = stats.mean, stats.std()
+        if out is None:
+            out = np.empty(np.shape(x), dtype=_as_float(x[:0], dtype).dtype)
+        for start, stop in _iter_chunks(x, chunksize):
+            chunk = _as_float(x[start:stop], dtype)
+            out[start:stop] = (chunk - mean) / std if center else chunk / std
+        return out
+    x = _as_float(x, dtype)
+    if out is None:
+        out = np.empty_like(x)
+    if not center:
+        # *out* may be *x* itself, so it cannot hold scratch values here.
+        np.divide(x, x.std(axis=0, ddof=1), out=out)
+        return out
+    mean = x.mean(axis=0)
+    # Use *out* as scratch for the centred values, so the variance needs
+    # no full-size temporary.
+    np.subtract(x, mean, out=out)
+    std = np.sqrt(np.einsum("i...,i...->...", out, out) / (len(x) - 1))
+    np.divide(out, std, out=out)
+    return out
 
 
-def fold_change_to_log_ratio(x: float | np.ndarray, base: int = 2) -> float | np.ndarray:
+def fold_change_to_log_ratio(
+    x: float | np.ndarray | pd.Series | pd.DataFrame,
+    base: int = 2,
+    *,
+    out: np.ndarray | None = None,
+    dtype: np.dtype | type | None = None,
+) -> float | np.ndarray | pd.Series | pd.DataFrame:
     """Convert fold change to log ratio.
 
     Parameters
     ----------
-    x : float or array-like
+    x : float, array-like, pandas.Series, or pandas.DataFrame
         Fold-change values. Negative values are treated as reciprocal
         fold changes: ``-4`` means ``1/4``.
     base : int
         Logarithm base (default ``2``).
+    out : numpy.ndarray, optional
+        Array of the same shape as *x* to write the result into. May be
+        *x* itself to compute in place when *x* is an array; pandas
+        objects are not accepted as *out*.
+    dtype : numpy.dtype, optional
+        Floating-point type of the result. By default, the input
+        precision is kept (``float64`` for non-float input).
 
     Returns
     -------
-    float or numpy.ndarray
+    float, numpy.ndarray, pandas.Series, or pandas.DataFrame
+        Same type as *x*. Pandas input keeps its index and column names,
+        and the result wraps the output array without copying.
 
     Notes
     -----
@@ -121,26 +899,48 @@ def fold_change_to_log_ratio(x: float | np.ndarray, base: int = 2) -> float | np
     first transformed to ``1 / -x`` before taking the logarithm, so the result
     is negative (down-regulation) as expected.
     """
-    x = np.asarray(x, dtype=float)
-    # Negative fold change → reciprocal (R: object <- ifelse(object < 0, 1/-object, object))
-    transformed = np.where(x < 0, 1.0 / (-x), x)
-    result = np.log(transformed) / np.log(base)
-    return float(result) if result.ndim == 0 else result
+    _check_out(out)
+    values = _as_float(x, dtype)
+    # Negative fold change → reciprocal (R: object <- ifelse(object < 0, 1/-object, object)),
+    # and log(1 / -x) == -log(|x|).
+    negative = values < 0
+    if out is None:
+        out = np.empty_like(values)
+    np.abs(values, out=out)
+    np.log(out, out=out)
+    np.negative(out, out=out, where=negative)
+    np.divide(out, np.log(base), out=out)
+    return float(out) if out.ndim == 0 else _like(out, x)
 
 
-def log_ratio_to_fold_change(x: float | np.ndarray, base: int = 2) -> float | np.ndarray:
+def log_ratio_to_fold_change(
+    x: float | np.ndarray | pd.Series | pd.DataFrame,
+    base: int = 2,
+    *,
+    out: np.ndarray | None = None,
+    dtype: np.dtype | type | None = None,
+) -> float | np.ndarray | pd.Series | pd.DataFrame:
     """Convert log ratio to fold change.
 
     Parameters
     ----------
-    x : float or array-like
+    x : float, array-like, pandas.Series, or pandas.DataFrame
         Log-ratio values.
     base : int
         Logarithm base (default ``2``).
+    out : numpy.ndarray, optional
+        Array of the same shape as *x* to write the result into. May be
+        *x* itself to compute in place when *x* is an array; pandas
+        objects are not accepted as *out*.
+    dtype : numpy.dtype, optional
+        Floating-point type of the result. By default, the input
+        precision is kept (``float64`` for non-float input).
 
     Returns
     -------
-    float or numpy.ndarray
+    float, numpy.ndarray, pandas.Series, or pandas.DataFrame
+        Same type as *x*. Pandas input keeps its index and column names,
+        and the result wraps the output array without copying.
 
     Notes
     -----
@@ -148,27 +948,433 @@ def log_ratio_to_fold_change(x: float | np.ndarray, base: int = 2) -> float | np
     result ``< 1`` is replaced by ``-1 / result`` to give a negative fold
     change representing down-regulation.
     """
-    x = np.asarray(x, dtype=float)
-    fc = np.float_power(base, x)
-    # Where result < 1 → -1/fc  (R: ifelse(object < 1, -1/object, object))
-    result = np.where(fc < 1.0, -1.0 / fc, fc)
-    return float(result) if result.ndim == 0 else result
+    _check_out(out)
+    values = _as_float(x, dtype)
+    if out is None:
+        out = np.empty_like(values)
+    np.power(np.asarray(base, dtype=out.dtype), values, out=out)
+    # Where result < 1 → -1/fc  (R: ifelse(object < 1, -1/object, object)),
+    # evaluated only on the masked elements.
+    np.divide(-1.0, out, out=out, where=out < 1.0)
+    return float(out) if out.ndim == 0 else _like(out, x)
+
+
+def _tie_runs(sv: np.ndarray) -> tuple[np.ndarray, np.ndarray]:
+    """Return start and end positions of runs of equal values in sorted *sv*.
+
+    Trailing ``NaN`` values are excluded.
+    """
+    m = int(np.count_nonzero(~np.isnan(sv)))
+    if m == 0:
+        return np.empty(0, np.intp), np.empty(0, np.intp)
+    starts = np.flatnonzero(np.r_[True, sv[1:m] != sv[: m - 1]])
+    return starts, np.r_[starts[1:], m]
+
+
+def _sorted_ranks(v: np.ndarray) -> tuple[np.ndarray, np.ndarray]:
+    """Return the stable sort order of *v* and the rank at each sorted position.
+
+    Ties share their average rank (1-based). ``NaN`` sorts last and is
+    ranked ``NaN``, as with ``na_option="keep"`` in pandas.
+    """
+    order = np.argsort(v, kind="stable")
+    starts, ends = _tie_runs(v[order])
+    ranks = np.full(len(v), np.nan)
+    # Average of the ranks starts + 1 .. ends.
+    ranks[: ends[-1] if len(ends) else 0] = np.repeat((starts + ends + 1) / 2, ends - starts)
+    return order, ranks
+
+
+def _map_columns(
+    func: Callable[[int], None],
+    n_cols: int,
+    *,
+    workers: int,
+) -> None:
+    """Call *func* on every column index, splitting columns across threads."""
+    n_workers = cpus(workers)
+    if n_workers == 1:
+        for j in range(n_cols):
+            func(j)
+        return
+
+    def run(cols: np.ndarray) -> None:
+        for j in cols:
+            func(int(j))
+
+    with ThreadPoolExecutor(max_workers=n_workers) as pool:
+        futures = [pool.submit(run, cols) for cols in np.array_split(np.arange(n_cols), n_workers)]
+        for future in futures:
+            future.result()
+
+
+_engines = ("threads", "processes")
+"""Execution engines for column-blocked kernels (see :func:`_run_blocks`)."""
+
+
+def _blocks(n_items: int, n_workers: int) -> list[tuple[int, int]]:
+    """Split ``range(n_items)`` into at most *n_workers* contiguous ``(start, stop)`` blocks."""
+    bounds = np.linspace(0, n_items, min(n_workers, n_items) + 1).astype(int)
+    return list(zip(bounds[:-1].tolist(), bounds[1:].tolist(), strict=True))
+
+
+def _n_workers(workers: int | None, engine: str) -> int:
+    """Resolve *workers*: by default one thread, or every CPU for processes."""
+    if workers is None:
+        workers = 0 if engine == "processes" else 1
+    return cpus(workers)
+
+
+def _check_engine(engine: str) -> None:
+    """Raise :class:`ValueError` for an unknown execution engine."""
+    if engine not in _engines:
+        raise ValueError(f"Unsupported engine {engine!r}; use one of {_engines}.")
+
+
+def _shared_worker(
+    kernel: Callable[..., None],
+    *,
+    x_spec: tuple,
+    out_spec: tuple,
+    block: tuple[int, int],
+    kwargs: dict[str, object],
+) -> None:
+    """Run *kernel* on one block in a worker process, on shared-memory arrays.
+
+    Each spec is a ``(name, shape, dtype)`` tuple, or a tuple of them for
+    a tuple of arrays.
+    """
+    segments: list[SharedMemory] = []
+
+    def attach(spec: tuple) -> np.ndarray | tuple[np.ndarray, ...]:
+        if not isinstance(spec[0], str):
+            return tuple(attach(s) for s in spec)
+        shm = SharedMemory(name=spec[0])
+        segments.append(shm)
+        return np.ndarray(spec[1], dtype=spec[2], buffer=shm.buf)
+
+    try:
+        x = attach(x_spec)
+        out = attach(out_spec)
+        kernel(x, out, start=block[0], stop=block[1], **kwargs)
+        # Views must be released before the segments can be closed.
+        del x, out
+    finally:
+        for shm in segments:
+            # If the kernel raised, its traceback still holds the views;
+            # the mappings are then released when the worker exits.
+            with contextlib.suppress(BufferError):
+                shm.close()
+
+
+def _run_blocks(
+    kernel: Callable[..., None],
+    x: np.ndarray | tuple[np.ndarray, ...],
+    *,
+    out: np.ndarray | tuple[np.ndarray, ...],
+    n_items: int,
+    engine: str,
+    workers: int | None,
+    **kwargs: object,
+) -> None:
+    """Call ``kernel(x, out, start=start, stop=stop, **kwargs)`` on blocks of *n_items*.
+
+    The kernel reads its block of *x* (e.g. a range of columns) and
+    writes the matching block of *out*; either may be a tuple of arrays,
+    which is passed to the kernel as such. With ``engine="processes"``,
+    *kernel* must be a module-level function: every input is copied once
+    into shared memory, workers attach to it and to shared output
+    buffers instead of receiving pickled arrays, and the outputs are
+    copied back into *out*.
+
+    With a single block (one worker or one item) the kernel runs in the
+    calling process whatever the engine, as a pool would only add
+    overhead.
+    """
+    _check_engine(engine)
+    blocks = _blocks(n_items, _n_workers(workers, engine))
+    if len(blocks) <= 1:
+        for start, stop in blocks:
+            kernel(x, out, start=start, stop=stop, **kwargs)
+        return
+    if engine == "threads":
+        with ThreadPoolExecutor(max_workers=max(len(blocks), 1)) as pool:
+            futures = [
+                pool.submit(kernel, x, out, start=start, stop=stop, **kwargs)
+                for start, stop in blocks
+            ]
+            for future in futures:
+                future.result()
+        return
+    inputs = x if isinstance(x, tuple) else (x,)
+    outputs = out if isinstance(out, tuple) else (out,)
+    segments: list[SharedMemory] = []
+    try:
+        specs = []
+        for arr in (*inputs, *outputs):
+            segments.append(SharedMemory(create=True, size=max(arr.nbytes, 1)))
+            specs.append((segments[-1].name, arr.shape, arr.dtype.str))
+        for arr, shm in zip(inputs, segments, strict=False):
+            np.ndarray(arr.shape, dtype=arr.dtype, buffer=shm.buf)[...] = arr
+        x_spec = tuple(specs[: len(inputs)]) if isinstance(x, tuple) else specs[0]
+        out_spec = tuple(specs[len(inputs) :]) if isinstance(out, tuple) else specs[-1]
+        # Forking a process that already runs threads (BLAS, Arrow) can
+        # deadlock, so start workers from a fork server where available.
+        methods = multiprocessing.get_all_start_methods()
+        context = multiprocessing.get_context("forkserver") if "forkserver" in methods else None
+        with ProcessPoolExecutor(max_workers=len(blocks), mp_context=context) as pool:
+            futures = [
+                pool.submit(
+                    _shared_worker,
+                    kernel,
+                    x_spec=x_spec,
+                    out_spec=out_spec,
+                    block=block,
+                    kwargs=kwargs,
+                )
+                for block in blocks
+            ]
+            for future in futures:
+                future.result()
+        for arr, shm in zip(outputs, segments[len(inputs) :], strict=True):
+            arr[...] = np.ndarray(arr.shape, dtype=arr.dtype, buffer=shm.buf)
+    finally:
+        for shm in segments:
+            shm.close()
+            shm.unlink()
+
+
+def _rank_kernel(x: np.ndarray, out: np.ndarray, *, start: int, stop: int) -> None:
+    """Rank columns *start* to *stop* of matrix *x* into *out*."""
+    for j in range(start, stop):
+        order, ranks = _sorted_ranks(x[:, j])
+        out[order, j] = ranks
+
+
+def _geometric_mean_kernel(
+    x: np.ndarray,
+    out: np.ndarray,
+    *,
+    start: int,
+    stop: int,
+    axis: int,
+    remove_na: bool,
+    zero_propagate: bool,
+) -> None:
+    """Compute geometric means of slices *start* to *stop* along *axis* into *out*."""
+    block = x[:, start:stop] if axis == 0 else x[start:stop]
+    out[start:stop] = geometric_mean(
+        block, axis=axis, remove_na=remove_na, zero_propagate=zero_propagate
+    )
+
+
+def _zscore_kernel(
+    x: np.ndarray,
+    out: np.ndarray,
+    *,
+    start: int,
+    stop: int,
+    center: bool,
+) -> None:
+    """Compute Z-scores of columns *start* to *stop* of matrix *x* into *out*."""
+    zscore(x[:, start:stop], center=center, out=out[:, start:stop])
+
+
+def _ranked_sparse(
+    x: scipy.sparse.sparray | scipy.sparse.spmatrix,
+    *,
+    dtype: np.dtype | type,
+    workers: int,
+) -> tuple[scipy.sparse.sparray | scipy.sparse.spmatrix, np.ndarray]:
+    """Rank the columns of sparse *x*, with implicit zeros ranked analytically."""
+    fmt = x.format
+    x = x.tocsc()
+    if not x.has_canonical_format:
+        x = x.copy()
+        x.sum_duplicates()
+    n = x.shape[0]
+    data = np.empty(len(x.data), dtype=dtype)
+    zero_ranks = np.empty(x.shape[1], dtype=dtype)
+
+    def rank_col(j: int) -> None:
+        lo, hi = x.indptr[j], x.indptr[j + 1]
+        d = x.data[lo:hi].astype(float, copy=False)
+        negative = d < 0
+        n_neg = int(negative.sum())
+        n_zero = n - (hi - lo) + int((d == 0).sum())
+        zero_ranks[j] = n_neg + (n_zero + 1) / 2
+        ranks = np.full(hi - lo, zero_ranks[j])
+        ranks[np.isnan(d)] = np.nan
+        for mask, offset in ((negative, 0), (d > 0, n_neg + n_zero)):
+            order, r = _sorted_ranks(d[mask])
+            part = np.empty(len(r))
+            part[order] = r + offset
+            ranks[mask] = part
+        data[lo:hi] = ranks
+
+    _map_columns(rank_col, x.shape[1], workers=workers)
+    ranked = type(x)((data, x.indices, x.indptr), shape=x.shape)
+    return ranked.asformat(fmt), zero_ranks
 
 
 def ranked_matrix(
-    x: pd.DataFrame,
-) -> pd.DataFrame:
+    x: pd.DataFrame | np.ndarray | scipy.sparse.sparray | scipy.sparse.spmatrix,
+    *,
+    dtype: np.dtype | type = np.float64,
+    workers: int | None = None,
+    engine: str = "threads",
+) -> pd.DataFrame | np.ndarray | tuple[scipy.sparse.sparray | scipy.sparse.spmatrix, np.ndarray]:
     """Rank values within each column, with ties averaged.
 
     Parameters
     ----------
-    x : pandas.DataFrame
-        Numeric data frame.
+    x : pandas.DataFrame, numpy.ndarray, or scipy.sparse matrix
+        Numeric data frame, vector, or matrix. ``NaN`` values are kept
+        and ranked ``NaN``. Data frames with non-numeric columns are
+        ranked with :meth:`pandas.DataFrame.rank`.
+    dtype : numpy.dtype
+        Floating-point type of the ranks (default ``float64``).
+    workers : int, optional
+        Maximum number of threads or processes ranking columns in
+        parallel. By default, one thread, or every available CPU with
+        ``engine='processes'``. Use ``0`` for all available CPUs.
+    engine : str
+        ``'threads'`` (default) or ``'processes'``. Processes share the
+        input and the ranks through :mod:`multiprocessing.shared_memory`
+        instead of pickling them, and scale the per-column sorting
+        beyond what releasing the GIL allows. Sparse input always uses
+        threads.
+
+    Returns
+    -------
+    pandas.DataFrame, numpy.ndarray, or tuple
+        Ranks of the same shape and type as *x*, preserving index and
+        column names for data frames. For sparse input, a
+        ``(ranks, zero_ranks)`` tuple: a sparse matrix with the ranks of
+        the stored entries, and the rank shared by every zero entry of
+        each column.
+    """
+    if scipy.sparse.issparse(x):
+        return _ranked_sparse(x, dtype=dtype, workers=_n_workers(workers, "threads"))
+    if isinstance(x, pd.DataFrame) and not all(map(pd.api.types.is_numeric_dtype, x.dtypes)):
+        # Non-numeric columns (e.g. strings) have no float representation.
+        return x.rank(method="average").astype(dtype)
+    values = _as_float(x.to_numpy() if isinstance(x, pd.DataFrame) else x)
+    matrix = values.reshape(values.shape[0], int(np.prod(values.shape[1:])))
+    out = np.empty(matrix.shape, dtype=dtype)
+    _run_blocks(
+        _rank_kernel, matrix, out=out, n_items=matrix.shape[1], engine=engine, workers=workers
+    )
+    out = out.reshape(values.shape)
+    return _like(out, x)
+
+
+def _quantile_sort_kernel(
+    x: np.ndarray,
+    out: tuple[np.ndarray, np.ndarray],
+    *,
+    start: int,
+    stop: int,
+) -> None:
+    """Sort columns *start* to *stop* of *x* into the sort orders and sorted values of *out*."""
+    orders, sorted_values = out
+    for j in range(start, stop):
+        orders[:, j] = np.argsort(x[:, j], kind="stable")
+        sorted_values[:, j] = x[orders[:, j], j]
+
+
+def _quantile_scatter_kernel(
+    x: tuple[np.ndarray, np.ndarray],
+    out: np.ndarray,
+    *,
+    start: int,
+    stop: int,
+    cumulative: np.ndarray,
+) -> None:
+    """Give each tie run of columns *start* to *stop* its mean reference value."""
+    orders, sorted_values = x
+    for j in range(start, stop):
+        starts, ends = _tie_runs(sorted_values[:, j])
+        run_means = (cumulative[ends] - cumulative[starts]) / (ends - starts)
+        out[orders[:, j], j] = np.repeat(run_means, ends - starts)
+
+
+def quantile_normalize(
+    x: pd.DataFrame | np.ndarray,
+    *,
+    out: np.ndarray | None = None,
+    dtype: np.dtype | type | None = None,
+    workers: int | None = None,
+    engine: str = "threads",
+) -> pd.DataFrame | np.ndarray:
+    """Quantile normalise the columns of a matrix.
+
+    Each column is sorted once; the sorted columns are averaged into a
+    reference distribution, which is then scattered back to every column
+    in the original order. Tied values receive the mean of the reference
+    over their tied positions, consistent with the averaged ranks of
+    :func:`ranked_matrix`.
+
+    Parameters
+    ----------
+    x : pandas.DataFrame or numpy.ndarray
+        Numeric 2-D data without missing values.
+    out : numpy.ndarray, optional
+        Array of the same shape as *x* to write the result into. May be
+        *x* itself to normalise in place when *x* is an array; data
+        frames are not accepted as *out*.
+    dtype : numpy.dtype, optional
+        Floating-point type of the result. By default, the input
+        precision is kept (``float64`` for non-float input).
+    workers : int, optional
+        Maximum number of threads or processes sorting and scattering
+        columns in parallel. By default, one thread, or every available
+        CPU with ``engine='processes'``. Use ``0`` for all available
+        CPUs.
+    engine : str
+        ``'threads'`` (default) or ``'processes'``, which share the
+        data, sort orders, and result through
+        :mod:`multiprocessing.shared_memory`.
 
     Returns
     -------
-    pandas.DataFrame
-        Data frame of the same shape containing ranks, preserving
-        index and column names.
+    pandas.DataFrame or numpy.ndarray
+        Normalised values of the same shape and type as *x*, preserving
+        index and column names for data frames.
+
+    Raises
+    ------
+    ValueError
+        If *x* is not 2-D or contains ``NaN``.
     """
-    return x.rank(method="average")
+    _check_out(out)
+    values = _as_float(x.to_numpy() if isinstance(x, pd.DataFrame) else x, dtype)
+    if values.ndim != 2:
+        raise ValueError(f"Quantile normalisation requires a 2-D matrix, got {values.ndim}-D.")
+    if np.isnan(values).any():
+        raise ValueError("Quantile normalisation requires data without NaN.")
+    if out is None:
+        out = np.empty_like(values)
+    orders = np.empty(values.shape, dtype=np.intp)
+    n_cols = values.shape[1]
+    # Pass 1: sort each column once, using *out* to hold the sorted values.
+    _run_blocks(
+        _quantile_sort_kernel,
+        values,
+        out=(orders, out),
+        n_items=n_cols,
+        engine=engine,
+        workers=workers,
+    )
+    reference = out.mean(axis=1, dtype=np.float64)
+    # Pass 2: scatter the reference back through the saved sort orders.
+    _run_blocks(
+        _quantile_scatter_kernel,
+        (orders, out),
+        out=out,
+        n_items=n_cols,
+        engine=engine,
+        workers=workers,
+        cumulative=np.r_[0.0, np.cumsum(reference)],
+    )
+    return _like(out, x)
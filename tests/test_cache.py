@@ -0,0 +1,157 @@
+"""Tests for acidbase._cache."""
+
+import os
+from pathlib import Path
+
+import pytest
+
+from acidbase import (
+    cache_export,
+    cache_import,
+    cache_index,
+    cache_open,
+    cache_prefetch,
+    cache_read,
+    cache_recompress,
+    cache_remove,
+    cache_write,
+    pkg_cache_dir,
+)
+
+
+@pytest.fixture(autouse=True)
+def _xdg_cache(tmp_path: Path, monkeypatch: pytest.MonkeyPatch) -> None:
+    monkeypatch.setenv("XDG_CACHE_HOME", str(tmp_path))
+
+
+class TestPkgCacheDir:
+    """Tests for pkg_cache_dir."""
+
+    def test_created(self, tmp_path: Path) -> None:
+        """Cache directory is created under XDG_CACHE_HOME."""
+        path = pkg_cache_dir("example")
+        assert os.path.isdir(path)
+        assert path == str(tmp_path / "example")
+
+
+class TestCacheEntries:
+    """Tests for compressed cache entries."""
+
+    @pytest.mark.parametrize("codec", ["none", "fast", "gz", "bz2", "xz"])
+    def test_roundtrip(self, codec: str) -> None:
+        """Content is decoded transparently for every codec."""
+        content = b"gene\tcount\n" * 1000
+        cache_write("table", content, codec=codec)
+        assert cache_read("table") == content
+        record = cache_index()["table"]
+        assert record["codec"] == codec
+        assert record["size"] == len(content)
+
+    def test_compressed_at_rest(self) -> None:
+        """Compressible entries take less space on disk."""
+        content = "ACGT" * 10000
+        path = cache_write("seq", content, codec="xz")
+        assert os.path.getsize(path) < len(content)
+        assert cache_index()["seq"]["stored_size"] == os.path.getsize(path)
+
+    def test_path_source(self, tmp_path: Path) -> None:
+        """Path input is streamed from file."""
+        src = tmp_path / "input.txt"
+        src.write_bytes(b"hello\n")
+        cache_write("file", src)
+        with cache_open("file") as f:
+            assert f.read() == b"hello\n"
+
+    def test_failed_write(self, tmp_path: Path) -> None:
+        """A failed write leaves no temporary file behind."""
+        with pytest.raises(FileNotFoundError):
+            cache_write("file", tmp_path / "missing.txt")
+        assert os.listdir(Path(pkg_cache_dir()) / "entries") == []
+        assert "file" not in cache_index()
+
+    def test_recompress(self) -> None:
+        """Re-encoding changes the codec and keeps the content."""
+        old = cache_write("entry", b"x" * 100, codec="fast")
+        new = cache_recompress("entry", "xz")
+        assert cache_index()["entry"]["codec"] == "xz"
+        assert cache_read("entry") == b"x" * 100
+        assert not os.path.exists(old)
+        assert os.path.exists(new)
+
+    def test_remove(self) -> None:
+        """Removed entries are gone from the index."""
+        cache_write("entry", b"data")
+        assert cache_remove("entry")
+        assert "entry" not in cache_index()
+        assert not cache_remove("entry")
+
+    def test_missing(self) -> None:
+        """Missing key raises KeyError."""
+        with pytest.raises(KeyError):
+            cache_read("missing")
+
+    def test_invalid_codec(self) -> None:
+        """Invalid codec raises ValueError."""
+        with pytest.raises(ValueError, match="codec"):
+            cache_write("entry", b"data", codec="rar")
+
+
+class TestCachePrefetch:
+    """Tests for cache_prefetch, cache_export, and cache_import."""
+
+    def test_hits_and_fills(self) -> None:
+        """Existing entries are reported as hits, new ones as fills."""
+        cache_write("a", b"old")
+        manifest = [
+            {"key": "a", "func": bytes, "args": [b"new"]},
+            {"key": "b", "func": str.upper, "args": ["abc"], "codec": "xz"},
+        ]
+        report = cache_prefetch(manifest, workers=2)
+        assert report == {"hits": ["a"], "fills": ["b"], "failed": []}
+        assert cache_read("a") == b"old"
+        assert cache_read("b") == b"ABC"
+        assert cache_index()["b"]["codec"] == "xz"
+
+    def test_repeated_key(self) -> None:
+        """A repeated key is filled once from its first entry."""
+        manifest = [
+            {"key": "k", "func": bytes, "args": [b"first"]},
+            {"key": "k", "func": bytes, "args": [b"second"]},
+        ]
+        assert cache_prefetch(manifest, workers=2) == {"hits": [], "fills": ["k"], "failed": []}
+        assert cache_read("k") == b"first"
+
+    def test_url(self, tmp_path: Path) -> None:
+        """URL specs are downloaded into the cache."""
+        src = tmp_path / "remote.txt"
+        src.write_bytes(b"remote\n")
+        report = cache_prefetch([src.as_uri()])
+        assert report["fills"] == [src.as_uri()]
+        assert cache_read(src.as_uri()) == b"remote\n"
+
+    def test_failed(self, tmp_path: Path) -> None:
+        """A failing entry is reported without losing the others."""
+        manifest = [
+            {"key": "a", "func": bytes, "args": [b"data"]},
+            {"key": "b", "url": (tmp_path / "missing.txt").as_uri()},
+        ]
+        with pytest.warns(RuntimeWarning, match="'b'"):
+            report = cache_prefetch(manifest)
+        assert report == {"hits": [], "fills": ["a"], "failed": ["b"]}
+        assert list(cache_index()) == ["a"]
+
+    def test_invalid_spec(self) -> None:
+        """Spec without url or func raises ValueError."""
+        with pytest.raises(ValueError, match="url"):
+            cache_prefetch([{"key": "a"}])
+
+    def test_export_import(self, tmp_path: Path) -> None:
+        """Exported cache is imported into another package cache."""
+        cache_write("a", b"alpha", codec="fast")
+        cache_write("b", b"beta", codec="xz")
+        archive = cache_export(tmp_path / "scratch" / "cache.tar")
+        assert os.path.isfile(archive)
+        assert sorted(cache_import(archive, package="worker")) == ["a", "b"]
+        assert cache_read("a", package="worker") == b"alpha"
+        assert cache_index("worker")["b"]["codec"] == "xz"
+        assert cache_import(archive, package="worker") == []
@@ -1,17 +1,26 @@
 """Tests for acidbase._data."""
 
+import gzip
+from pathlib import Path
+
+import numpy as np
 import pandas as pd
 import pytest
 
 from acidbase import (
+    MatchIndex,
+    NestedIndex,
     dupes,
     headtail,
     intersect_all,
+    intersection_counts,
     intersection_matrix,
     keep_only_atomic_cols,
     match_all,
     match_nested,
     not_dupes,
+    optimize_dtypes,
+    pairwise_overlap,
 )
 
 
@@ -26,6 +35,58 @@ class TestDupes:
         """Returns empty list when no duplicates."""
         assert dupes([1, 2, 3]) == []
 
+    def test_array_numeric_order(self) -> None:
+        """Arrays are sorted numerically, not by string."""
+        result = dupes(np.array([10, 2, 10, 2, 3]))
+        assert isinstance(result, np.ndarray)
+        assert result.tolist() == [2, 10]
+
+    @pytest.mark.parametrize("cls", [pd.Series, pd.Index])
+    def test_pandas(self, cls: type) -> None:
+        """Series and Index inputs use the vectorised path."""
+        result = dupes(cls(["b", "a", "b", "c", "a"]))
+        assert result.tolist() == ["a", "b"]
+
+    def test_unsorted(self) -> None:
+        """sort=False returns values in order of first appearance."""
+        assert dupes(np.array([3, 1, 3, 1]), sort=False).tolist() == [3, 1]
+        assert dupes(["b", "a", "b", "a"], sort=False) == ["b", "a"]
+
+    def test_counts(self) -> None:
+        """counts=True also returns occurrence counts."""
+        values, counts = dupes(np.array([1, 2, 2, 3, 3, 3]), counts=True)
+        assert values.tolist() == [2, 3]
+        assert counts.tolist() == [2, 3]
+        assert dupes([1, 2, 2], counts=True) == ([2], [2])
+
+    def test_dataframe(self) -> None:
+        """Duplicated data frame rows are returned with group ids."""
+        df = pd.DataFrame(
+            {"a": [1, 2, 1, 3, 2, 1], "b": ["x", "y", "x", "z", "y", "w"]},
+            index=["r1", "r2", "r3", "r4", "r5", "r6"],
+        )
+        result = dupes(df)
+        assert isinstance(result, pd.Series)
+        assert result.to_dict() == {"r1": 0, "r3": 0, "r2": 1, "r5": 1}
+        assert list(dupes(df, sort=False).index) == ["r1", "r2", "r3", "r5"]
+        _, counts = dupes(df, counts=True)
+        assert counts.tolist() == [2, 2]
+
+    def test_dataframe_missing(self) -> None:
+        """Rows with missing values in the same places are duplicates."""
+        df = pd.DataFrame({"a": [1.0, np.nan, np.nan], "b": [None, "x", "x"]})
+        assert dupes(df).index.tolist() == [1, 2]
+
+    def test_dataframe_collision(self, monkeypatch: pytest.MonkeyPatch) -> None:
+        """Hash collisions fall back to exact grouping."""
+        df = pd.DataFrame({"a": [1, 2, 1, 3]})
+        monkeypatch.setattr(
+            pd.util,
+            "hash_pandas_object",
+            lambda obj, index: pd.Series(np.zeros(len(obj), dtype=np.uint64)),
+        )
+        assert dupes(df).index.tolist() == [0, 2]
+
 
 class TestNotDupes:
     """Tests for not_dupes."""
@@ -34,6 +95,16 @@ class TestNotDupes:
         """Returns non-duplicated values."""
         assert not_dupes([1, 2, 2, 3]) == [1, 3]
 
+    def test_dataframe(self) -> None:
+        """Returns labels of rows appearing once."""
+        df = pd.DataFrame({"a": [1, 2, 1], "b": ["x", "y", "x"]}, index=["r1", "r2", "r3"])
+        assert list(not_dupes(df)) == ["r2"]
+
+    def test_array(self) -> None:
+        """Arrays return an ndarray of unique-once values."""
+        result = not_dupes(np.array([10, 2, 2, 3]))
+        assert result.tolist() == [3, 10]
+
 
 class TestIntersectAll:
     """Tests for intersect_all."""
@@ -47,6 +118,34 @@ class TestIntersectAll:
         """No arguments returns empty list."""
         assert intersect_all() == []
 
+    def test_array(self) -> None:
+        """Numeric arrays return an ndarray in numeric order."""
+        result = intersect_all(
+            np.array([10, 2, 3, 2, 7]),
+            np.array([7, 2, 10, 11]),
+            pd.Series([2, 10, 7, 5]),
+        )
+        assert isinstance(result, np.ndarray)
+        assert result.tolist() == [2, 7, 10]
+
+    def test_presorted(self) -> None:
+        """Presorted inputs give the same result without sorting."""
+        rng = np.random.default_rng(0)
+        arrays = [np.sort(rng.integers(0, 1000, size)) for size in (500, 800, 300)]
+        expected = sorted(set(arrays[0]) & set(arrays[1]) & set(arrays[2]))
+        np.testing.assert_array_equal(intersect_all(*arrays), expected)
+        np.testing.assert_array_equal(intersect_all(*arrays, presorted=True), expected)
+        assert intersect_all(np.array([1, 2]), np.array([], dtype=int), presorted=True).size == 0
+
+    def test_object_array(self) -> None:
+        """Object arrays fall back to the set-based path."""
+        assert intersect_all(np.array(["a", 1], dtype=object), ["a"]) == ["a"]
+
+    def test_mixed_dtypes(self) -> None:
+        """Numbers and strings are not cast to a common type."""
+        assert intersect_all(np.array([1, 2]), np.array(["1", "3"])) == []
+        np.testing.assert_array_equal(intersect_all(np.array([1, 2]), np.array([2.0, 3.0])), [2])
+
 
 class TestIntersectionMatrix:
     """Tests for intersection_matrix."""
@@ -58,6 +157,86 @@ class TestIntersectionMatrix:
         assert result.loc[2, "a"] is True or result.loc[2, "a"]
         assert result.loc[4, "a"] is False or not result.loc[4, "a"]
 
+    def test_membership(self) -> None:
+        """Membership matches set containment for every item."""
+        sets = [{"x", "y"}, ["y", "z", "z"], np.array(["w", "y"])]
+        result = intersection_matrix(*sets, names=["a", "b", "c"])
+        assert list(result.index) == ["w", "x", "y", "z"]
+        for name, s in zip(result.columns, sets, strict=True):
+            assert result[name].tolist() == [item in set(s) for item in result.index]
+
+    def test_sparse(self) -> None:
+        """sparse=True returns sparse Boolean columns with the same values."""
+        dense = intersection_matrix([1, 2, 3], [2, 3, 4], names=["a", "b"])
+        result = intersection_matrix([1, 2, 3], [2, 3, 4], names=["a", "b"], sparse=True)
+        assert all(isinstance(dtype, pd.SparseDtype) for dtype in result.dtypes)
+        assert result.sparse.to_coo().nnz == 6
+        pd.testing.assert_frame_equal(result.sparse.to_dense(), dense)
+
+    def test_missing(self) -> None:
+        """Missing values are kept as an item of their own."""
+        result = intersection_matrix([1.0, 2.0, np.nan], [2.0, 3.0], names=["a", "b"])
+        assert len(result) == 4
+        assert np.isnan(result.index[-1])
+        assert result.iloc[-1].tolist() == [True, False]
+
+
+class TestIntersectionCounts:
+    """Tests for intersection_counts."""
+
+    def test_basic(self) -> None:
+        """Counts each exclusive membership combination."""
+        result = intersection_counts([1, 2, 3, 4], [3, 4, 5], [4], names=["a", "b", "c"])
+        assert list(result.columns) == ["a", "b", "c", "count"]
+        rows = {tuple(r[:3]): r[3] for r in result.itertuples(index=False)}
+        assert rows == {
+            (True, False, False): 2,
+            (True, True, False): 1,
+            (True, True, True): 1,
+            (False, True, False): 1,
+        }
+        assert result["count"].iloc[0] == 2
+
+    def test_many_sets(self) -> None:
+        """Bitmasks span multiple bytes for more than eight collections."""
+        sets = [[i, 100, 101] for i in range(12)]
+        result = intersection_counts(*sets)
+        assert result["count"].sum() == 14
+        assert result["count"].iloc[0] == 2
+        assert result.iloc[0, :12].all()
+        assert result.loc[1:, "count"].eq(1).all()
+
+
+class TestPairwiseOverlap:
+    """Tests for pairwise_overlap."""
+
+    def test_count(self) -> None:
+        """Counts match Python set intersections."""
+        sets = [{1, 2, 3}, [2, 3, 4, 4], np.array([5])]
+        result = pairwise_overlap(*sets, names=["a", "b", "c"])
+        assert list(result.index) == ["a", "b", "c"]
+        for i, x in enumerate(sets):
+            for j, y in enumerate(sets):
+                assert result.iloc[i, j] == len(set(x) & set(y))
+
+    def test_jaccard(self) -> None:
+        """Jaccard index is intersection over union."""
+        result = pairwise_overlap([1, 2, 3], [2, 3, 4], [], metric="jaccard")
+        assert result.loc["set1", "set2"] == pytest.approx(0.5)
+        assert result.loc["set1", "set1"] == 1.0
+        assert result.loc["set1", "set3"] == 0.0
+        assert np.isnan(result.loc["set3", "set3"])
+
+    def test_missing(self) -> None:
+        """Shared missing values count towards the overlap."""
+        result = pairwise_overlap(["a", None], [None, "b"])
+        assert result.loc["set1", "set2"] == 1
+
+    def test_invalid_metric(self) -> None:
+        """Invalid metric raises ValueError."""
+        with pytest.raises(ValueError, match="metric"):
+            pairwise_overlap([1], [2], metric="cosine")
+
 
 class TestKeepOnlyAtomicCols:
     """Tests for keep_only_atomic_cols."""
@@ -76,6 +255,70 @@ class TestKeepOnlyAtomicCols:
         assert "b" in result.columns
         assert "c" not in result.columns
 
+    def test_mixed(self) -> None:
+        """Non-atomic values after the first element are detected."""
+        df = pd.DataFrame(
+            {
+                "a": pd.Series(["x", None, [1, 2]], dtype=object),
+                "b": pd.Series([1, "y", None], dtype=object),
+                "c": pd.Series([None, None, None], dtype=object),
+            }
+        )
+        assert list(keep_only_atomic_cols(df).columns) == ["b", "c"]
+
+    def test_sample(self) -> None:
+        """Sample size limits the number of values inspected."""
+        df = pd.DataFrame({"a": pd.Series(["x"] * 99 + [[1]], dtype=object)})
+        assert list(keep_only_atomic_cols(df, sample=2).columns) == []
+        assert list(keep_only_atomic_cols(df, sample=1).columns) == ["a"]
+
+
+class TestOptimizeDtypes:
+    """Tests for optimize_dtypes."""
+
+    def test_basic(self) -> None:
+        """Integers are downcast and repeated strings become categories."""
+        df = pd.DataFrame(
+            {
+                "count": np.arange(1000, dtype=np.int64),
+                "organism": ["Homo sapiens", "Mus musculus"] * 500,
+                "sampleId": [f"sample{i}" for i in range(1000)],
+                "ratio": np.linspace(0, 1, 1000),
+                "flag": [True, False] * 500,
+            }
+        )
+        result = optimize_dtypes(df)
+        assert result["count"].dtype == np.int16
+        assert isinstance(result["organism"].dtype, pd.CategoricalDtype)
+        assert not isinstance(result["sampleId"].dtype, pd.CategoricalDtype)
+        assert result["ratio"].dtype == np.float64
+        assert result["flag"].dtype == bool
+        assert result.memory_usage(deep=True).sum() < df.memory_usage(deep=True).sum()
+        pd.testing.assert_frame_equal(result.astype(df.dtypes.to_dict()), df)
+
+    def test_downcast_float(self, capsys: pytest.CaptureFixture) -> None:
+        """Floats are downcast on request and the report is printed."""
+        df = pd.DataFrame({"x": [0.5, 1.5]})
+        result = optimize_dtypes(df, downcast_float=True, verbose=True)
+        assert result["x"].dtype == np.float32
+        assert "bytes" in capsys.readouterr().out
+
+    def test_arrow_strings(self) -> None:
+        """Object strings become Arrow strings keeping NaN; Arrow columns are kept."""
+        pytest.importorskip("pyarrow")
+        ids = [f"id{i}" for i in range(9)] + [np.nan]
+        df = pd.DataFrame(
+            {
+                "object": pd.Series(ids, dtype=object),
+                "arrow": pd.Series(ids, dtype=pd.StringDtype("pyarrow", na_value=np.nan)),
+            }
+        )
+        result = optimize_dtypes(df)
+        assert result["object"].dtype.storage == "pyarrow"
+        assert np.isnan(result["object"].dtype.na_value)
+        assert result["object"].isna().tolist() == df["object"].isna().tolist()
+        assert result["arrow"].dtype is df["arrow"].dtype
+
 
 class TestMatchAll:
     """Tests for match_all."""
@@ -90,6 +333,75 @@ class TestMatchAll:
         with pytest.raises(KeyError):
             match_all(["z"], ["a", "b"])
 
+    def test_all_positions(self) -> None:
+        """Every position of a repeated value is returned."""
+        assert match_all(["a", "b"], ["a", "b", "a"]) == [0, 2, 1]
+
+    def test_array(self) -> None:
+        """Array input returns an ndarray."""
+        result = match_all(np.array([3, 1]), np.array([1, 2, 3, 1]))
+        assert isinstance(result, np.ndarray)
+        assert result.tolist() == [2, 0, 3]
+
+    def test_nomatch_sentinel(self) -> None:
+        """Integer nomatch is emitted once per missing value."""
+        result = match_all(["z", "a", "y"], ["a", "b", "a"], nomatch=-1)
+        assert result == [-1, 0, 2, -1]
+
+    def test_nomatch_mask(self) -> None:
+        """nomatch='mask' skips missing values and returns a found mask."""
+        result, found = match_all(np.array(["z", "b"]), ["a", "b"], nomatch="mask")
+        assert result.tolist() == [1]
+        assert found.tolist() == [False, True]
+
+    def test_invalid_nomatch(self) -> None:
+        """Invalid nomatch raises ValueError."""
+        with pytest.raises(ValueError, match="nomatch"):
+            match_all(["a"], ["a"], nomatch="drop")
+
+
+class TestMatchIndex:
+    """Tests for MatchIndex."""
+
+    def test_match_all(self) -> None:
+        """Matches the positions returned by match_all."""
+        table = ["a", "b", "a", "c", "b", "a"]
+        index = MatchIndex(table)
+        query = ["b", "a", "c"]
+        result = index.match_all(query)
+        assert isinstance(result, np.ndarray)
+        assert result.tolist() == match_all(query, table)
+
+    def test_match_first(self) -> None:
+        """Returns the first position of each query."""
+        index = MatchIndex(np.array([5, 7, 5, 9]))
+        assert index.match_first(np.array([9, 5, 7, 5])).tolist() == [3, 0, 1, 0]
+
+    def test_csr_layout(self) -> None:
+        """Positions are grouped by value and delimited by offsets."""
+        index = MatchIndex(pd.Series(["x", "y", "x"]))
+        assert len(index) == 3
+        assert list(index.values) == ["x", "y"]
+        assert index.offsets.tolist() == [0, 2, 3]
+        assert index.positions.tolist() == [0, 2, 1]
+
+    def test_missing(self) -> None:
+        """Missing element raises KeyError."""
+        with pytest.raises(KeyError, match="z"):
+            MatchIndex(["a", "b"]).match_all(["a", "z"])
+
+    def test_match_first_nomatch(self) -> None:
+        """match_first fills or masks missing values."""
+        index = MatchIndex(["a", "b", "a"])
+        assert index.match_first(["z", "a"], nomatch=-1).tolist() == [-1, 0]
+        first, found = index.match_first(["z", "b"], nomatch="mask")
+        assert first.tolist() == [1]
+        assert found.tolist() == [False, True]
+
+    def test_empty_table(self) -> None:
+        """Lookups against an empty table are all missing."""
+        assert MatchIndex([]).match_all(["a", "b"], nomatch=-1).tolist() == [-1, -1]
+
 
 class TestMatchNested:
     """Tests for match_nested."""
@@ -103,6 +415,56 @@ class TestMatchNested:
         """Returns None when key not found."""
         assert match_nested("z", {"a": 1}) is None
 
+    def test_list(self) -> None:
+        """Finds items in nested lists."""
+        assert match_nested("b", [1, ["a", {"k": ["b"]}]]) == "b"
+
+    def test_depth_first_order(self) -> None:
+        """Returns the first match in depth-first order."""
+        data = {"a": {"x": 1}, "x": 2}
+        assert match_nested("x", data) == 1
+
+    def test_none_value(self) -> None:
+        """Stops at the first matching key even when its value is None."""
+        assert match_nested("a", {"a": None, "b": {"a": 1}}) is None
+
+    def test_deep(self) -> None:
+        """Deep structures do not hit the recursion limit."""
+        data: dict = {"leaf": 1}
+        for _ in range(5000):
+            data = {"node": data}
+        assert match_nested("leaf", data) == 1
+
+
+class TestNestedIndex:
+    """Tests for NestedIndex."""
+
+    def test_get(self) -> None:
+        """Lookups agree with match_nested."""
+        data = {"a": {"b": {"c": 42}}, "d": [{"c": 7}, "e"]}
+        index = NestedIndex(data)
+        for key in ("a", "b", "c", "d", "e", "z"):
+            assert index.get(key) == match_nested(key, data)
+        assert "c" in index
+        assert "z" not in index
+        assert index.get("z", "missing") == "missing"
+
+    def test_none_and_unhashable(self) -> None:
+        """A None match is returned and unhashable queries are not found."""
+        index = NestedIndex({"a": None, "b": {"a": 1}})
+        assert index.get("a", "missing") is None
+        assert index.get(["a"], "missing") == "missing"
+        assert ["a"] not in index
+        assert index.find_all(["a"]) == []
+
+    def test_find_all(self) -> None:
+        """Returns every match with its path."""
+        data = {"a": {"c": 42}, "d": [{"c": 7}]}
+        assert NestedIndex(data).find_all("c") == [
+            (("a", "c"), 42),
+            (("d", 0, "c"), 7),
+        ]
+
 
 class TestHeadtail:
     """Tests for headtail."""
@@ -113,3 +475,45 @@ class TestHeadtail:
         captured = capsys.readouterr()
         assert "1" in captured.out
         assert "5" in captured.out
+
+    def test_quiet(self, capsys: pytest.CaptureFixture) -> None:
+        """Nothing is printed when verbose=False."""
+        assert headtail([1, 2, 3, 4, 5], n=2, verbose=False) == [1, 2, 4, 5]
+        assert capsys.readouterr().out == ""
+
+    def test_iterator(self) -> None:
+        """Iterators are consumed lazily."""
+        assert headtail(iter(range(10**6)), n=2, verbose=False) == [0, 1, 999998, 999999]
+        assert headtail((i for i in range(3)), n=2, verbose=False) == [0, 1, 1, 2]
+
+    def test_file(self, tmp_path: Path) -> None:
+        """Files return their first and last lines."""
+        path = tmp_path / "lines.txt"
+        path.write_text("".join(f"line{i}\n" for i in range(10**5)))
+        assert headtail(path, n=2, verbose=False) == [
+            "line0",
+            "line1",
+            "line99998",
+            "line99999",
+        ]
+        assert headtail(str(path), n=1, verbose=False) == ["line0", "line99999"]
+
+    def test_short_file(self, tmp_path: Path) -> None:
+        """Short files without a trailing newline match list semantics."""
+        path = tmp_path / "short.txt"
+        path.write_text("a\nb\nc")
+        assert headtail(path, n=2, verbose=False) == ["a", "b", "b", "c"]
+
+    def test_file_small_blocks(self, tmp_path: Path, monkeypatch: pytest.MonkeyPatch) -> None:
+        """Tail lines spanning several backward reads are reassembled."""
+        monkeypatch.setattr("acidbase._data._tail_block_size", 3)
+        path = tmp_path / "lines.txt"
+        path.write_text("first\nsecond\nthird line\nlast line\n")
+        assert headtail(path, n=2, verbose=False) == ["first", "second", "third line", "last line"]
+
+    def test_gzip(self, tmp_path: Path) -> None:
+        """Gzip files are streamed."""
+        path = tmp_path / "lines.txt.gz"
+        with gzip.open(path, "wt") as f:
+            f.writelines(f"line{i}\n" for i in range(1000))
+        assert headtail(path, n=2, verbose=False) == ["line0", "line1", "line998", "line999"]
@@ -3,12 +3,22 @@
 import numpy as np
 import pandas as pd
 import pytest
+import scipy.sparse
+import scipy.sparse.linalg
 
+import acidbase._math
 from acidbase import (
+    RunningStats,
     euclidean,
     fold_change_to_log_ratio,
     geometric_mean,
+    grouped_geometric_mean,
+    grouped_sem,
+    grouped_zscore,
+    knn,
     log_ratio_to_fold_change,
+    pairwise_euclidean,
+    quantile_normalize,
     ranked_matrix,
     sem,
     zscore,
@@ -26,6 +36,82 @@ class TestEuclidean:
         """Same points have zero distance."""
         assert euclidean([1, 2], [1, 2]) == 0.0
 
+    def test_float32(self) -> None:
+        """Float32 input is computed in float32 unless dtype is given."""
+        a = np.array([0.0, 0.0], dtype=np.float32)
+        b = np.array([3.0, 4.0], dtype=np.float32)
+        assert euclidean(a, b) == pytest.approx(5.0)
+        assert euclidean(a, b, dtype=np.float64) == pytest.approx(5.0)
+
+
+class TestPairwiseEuclidean:
+    """Tests for pairwise_euclidean."""
+
+    def test_matches_euclidean(self) -> None:
+        """Blocked, threaded results match pairwise euclidean calls."""
+        rng = np.random.default_rng(0)
+        x, y = rng.normal(size=(7, 4)), rng.normal(size=(5, 4))
+        result = pairwise_euclidean(x, y, block_size=3, workers=2)
+        expected = [[euclidean(a, b) for b in y] for a in x]
+        np.testing.assert_allclose(result, expected)
+
+    def test_self(self) -> None:
+        """Distances within x have a zero diagonal and are symmetric."""
+        x = np.random.default_rng(1).normal(size=(6, 3))
+        result = pairwise_euclidean(x, block_size=4)
+        np.testing.assert_array_equal(np.diag(result), 0.0)
+        np.testing.assert_allclose(result, result.T)
+
+    def test_condensed(self) -> None:
+        """Condensed output matches scipy's pdist ordering."""
+        from scipy.spatial.distance import pdist
+
+        x = np.random.default_rng(2).normal(size=(11, 3))
+        result = pairwise_euclidean(x, block_size=4, condensed=True)
+        np.testing.assert_allclose(result, pdist(x))
+
+    def test_out_memmap(self, tmp_path) -> None:
+        """Results are written into a memmap."""
+        x = np.random.default_rng(3).normal(size=(5, 2))
+        out = np.lib.format.open_memmap(tmp_path / "d.npy", mode="w+", shape=(5, 5))
+        assert pairwise_euclidean(x, out=out) is out
+        np.testing.assert_allclose(out[0, 1], euclidean(x[0], x[1]))
+
+    def test_condensed_requires_self(self) -> None:
+        """Condensed output with y raises ValueError."""
+        with pytest.raises(ValueError, match="condensed"):
+            pairwise_euclidean(np.ones((2, 2)), np.ones((2, 2)), condensed=True)
+
+
+class TestKnn:
+    """Tests for knn."""
+
+    @pytest.mark.parametrize("dim", [3, 40])
+    def test_matches_brute_force(self, dim: int) -> None:
+        """Both search methods match a full distance matrix."""
+        x = np.random.default_rng(0).normal(size=(30, dim))
+        full = pairwise_euclidean(x)
+        np.fill_diagonal(full, np.inf)
+        expected = np.argsort(full, axis=1)[:, :4]
+        idx, dist = knn(x, 4, block_size=7, workers=2)
+        assert idx.shape == dist.shape == (30, 4)
+        np.testing.assert_array_equal(idx, expected)
+        np.testing.assert_allclose(dist, np.take_along_axis(full, expected, axis=1))
+
+    def test_duplicates(self) -> None:
+        """Duplicate points are neighbours but a row is never its own."""
+        x = np.array([[0.0, 0.0], [0.0, 0.0], [5.0, 5.0]])
+        idx, dist = knn(x, 1)
+        assert (idx[:, 0] != np.arange(3)).all()
+        assert dist[0, 0] == 0.0
+
+    def test_invalid(self) -> None:
+        """Invalid metric or k raises ValueError."""
+        with pytest.raises(ValueError, match="metric"):
+            knn(np.ones((3, 2)), 1, metric="cosine")
+        with pytest.raises(ValueError, match="k must"):
+            knn(np.ones((3, 2)), 3)
+
 
 class TestGeometricMean:
     """Tests for geometric_mean.
@@ -72,6 +158,30 @@ class TestGeometricMean:
         result = geometric_mean([2.0, float("nan"), 8.0])
         assert result == pytest.approx(4.0)
 
+    def test_vector_axis(self) -> None:
+        """A vector reduced along axis 0 gives a float, as NumPy reductions do."""
+        result = geometric_mean(np.array([1.0, 2.0, 4.0]), axis=0)
+        assert isinstance(result, float)
+        assert result == pytest.approx(2.0)
+
+    @pytest.mark.parametrize("axis", [0, 1])
+    @pytest.mark.parametrize("zero_propagate", [False, True])
+    def test_axis(self, axis: int, zero_propagate: bool) -> None:
+        """Per-slice results match the 1-D function on each slice."""
+        x = np.array([[1.0, 0.0, 4.0], [2.0, 8.0, np.nan], [-1.0, 3.0, 9.0]])
+        result = geometric_mean(x, axis=axis, zero_propagate=zero_propagate)
+        slices = x.T if axis == 0 else x
+        expected = [geometric_mean(v, zero_propagate=zero_propagate) for v in slices]
+        np.testing.assert_allclose(result, expected)
+
+    @pytest.mark.parametrize("fmt", [scipy.sparse.csr_array, scipy.sparse.csc_matrix])
+    @pytest.mark.parametrize("axis", [None, 0, 1])
+    def test_sparse(self, fmt: type, axis: int | None) -> None:
+        """Sparse input counts implicit zeros in the denominator."""
+        x = np.array([[0.0, 2.0, 0.0], [8.0, 0.0, 0.0], [2.0, 4.0, 0.0]])
+        expected = geometric_mean(x, axis=axis)
+        np.testing.assert_allclose(geometric_mean(fmt(x), axis=axis), expected)
+
 
 class TestSem:
     """Tests for sem."""
@@ -82,6 +192,38 @@ class TestSem:
         expected = float(np.std(x, ddof=1) / np.sqrt(5))
         assert sem(x) == pytest.approx(expected)
 
+    def test_chunked(self) -> None:
+        """Chunked mode matches the in-memory result."""
+        x = np.random.default_rng(0).normal(size=103)
+        assert sem(x, chunksize=10) == pytest.approx(sem(x))
+
+
+class TestRunningStats:
+    """Tests for RunningStats."""
+
+    def test_update(self) -> None:
+        """Chunked updates match NumPy column statistics."""
+        x = np.random.default_rng(0).normal(size=(100, 4))
+        stats = RunningStats((4,))
+        for start in range(0, 100, 7):
+            stats.update(x[start : start + 7])
+        assert stats.count == 100
+        np.testing.assert_allclose(stats.mean, x.mean(axis=0))
+        np.testing.assert_allclose(stats.var(), x.var(axis=0, ddof=1))
+        np.testing.assert_allclose(stats.std(ddof=0), x.std(axis=0))
+
+    def test_merge(self) -> None:
+        """Merging worker accumulators matches a single pass."""
+        x = np.random.default_rng(1).normal(loc=5.0, size=1000)
+        workers = [RunningStats().update(part) for part in np.array_split(x, 3)]
+        merged = RunningStats()
+        for worker in workers:
+            merged.merge(worker)
+        merged.merge(RunningStats())
+        assert merged.count == 1000
+        assert float(merged.mean) == pytest.approx(x.mean())
+        assert float(merged.std()) == pytest.approx(x.std(ddof=1))
+
 
 class TestZscore:
     """Tests for zscore."""
@@ -91,6 +233,75 @@ class TestZscore:
         result = zscore([1, 2, 3, 4, 5])
         assert result.mean() == pytest.approx(0.0, abs=1e-10)
 
+    def test_matrix(self) -> None:
+        """Columns have zero mean and unit standard deviation."""
+        x = np.random.default_rng(0).normal(size=(20, 3))
+        result = zscore(x)
+        np.testing.assert_allclose(result.mean(axis=0), 0.0, atol=1e-10)
+        np.testing.assert_allclose(result.std(axis=0, ddof=1), 1.0)
+
+    def test_float32_in_place(self) -> None:
+        """Float32 precision is kept and out may be the input itself."""
+        x = np.random.default_rng(0).normal(size=(20, 3)).astype(np.float32)
+        expected = zscore(x.astype(np.float64))
+        result = zscore(x, out=x)
+        assert result is x
+        assert result.dtype == np.float32
+        np.testing.assert_allclose(result, expected, rtol=1e-5, atol=1e-6)
+
+    def test_scale_only_in_place(self) -> None:
+        """center=False with out=x divides the original values."""
+        y = np.array([[1.0, 2.0], [3.0, 5.0], [4.0, 9.0]])
+        expected = y / y.std(axis=0, ddof=1)
+        assert zscore(y, center=False, out=y) is y
+        np.testing.assert_allclose(y, expected)
+
+    def test_dtype(self) -> None:
+        """Dtype sets the result type."""
+        assert zscore(np.arange(5), dtype=np.float32).dtype == np.float32
+
+    def test_chunked_memmap(self, tmp_path) -> None:
+        """Chunked mode streams a memmap into an out memmap."""
+        x = np.random.default_rng(0).normal(size=(50, 3))
+        path = tmp_path / "x.npy"
+        np.save(path, x)
+        out = np.lib.format.open_memmap(tmp_path / "z.npy", mode="w+", shape=x.shape)
+        result = zscore(np.load(path, mmap_mode="r"), chunksize=8, out=out)
+        assert result is out
+        np.testing.assert_allclose(result, zscore(x))
+
+    def test_sparse_operator(self) -> None:
+        """Sparse input returns a lazy operator matching dense Z-scores."""
+        x = scipy.sparse.random_array((30, 5), density=0.3, format="csr", rng=0)
+        expected = zscore(x.toarray())
+        op = zscore(x)
+        assert isinstance(op, scipy.sparse.linalg.LinearOperator)
+        v = np.arange(5.0)
+        np.testing.assert_allclose(op @ v, expected @ v)
+        np.testing.assert_allclose(op.T @ np.ones(30), expected.T @ np.ones(30), atol=1e-10)
+        np.testing.assert_allclose(op @ np.eye(5), expected)
+        np.testing.assert_allclose(op.block(10, 20), expected[10:20])
+
+    @pytest.mark.parametrize("fmt", [scipy.sparse.csr_array, scipy.sparse.csc_array])
+    def test_sparse_large_offset(self, fmt: type) -> None:
+        """Columns with a large mean keep their spread."""
+        rng = np.random.default_rng(0)
+        dense = rng.normal(size=(10_000, 3)) + np.array([0.0, 1e6, 1e8])
+        dense[::3, 0] = 0.0
+        x = fmt(dense)
+        expected = dense.std(axis=0, ddof=1)
+        np.testing.assert_allclose(zscore(x, center=False).toarray(), dense / expected)
+        np.testing.assert_allclose(zscore(x).block(0, 100), zscore(dense)[:100], atol=1e-6)
+
+    def test_sparse_scale_only(self) -> None:
+        """center=False keeps sparse input sparse."""
+        x = scipy.sparse.random_array((30, 5), density=0.3, format="csc", rng=1)
+        result = zscore(x, center=False)
+        assert scipy.sparse.issparse(result)
+        assert result.format == "csc"
+        assert result.nnz == x.nnz
+        np.testing.assert_allclose(result.toarray(), zscore(x.toarray(), center=False))
+
 
 class TestFoldChangeLogRatio:
     """Tests for fold_change_to_log_ratio and log_ratio_to_fold_change.
@@ -132,6 +343,33 @@ class TestFoldChangeLogRatio:
         result = log_ratio_to_fold_change(lr, base=2)
         np.testing.assert_allclose(result, expected, atol=1e-10)
 
+    def test_out_and_dtype(self) -> None:
+        """Float32 input stays float32 and results can be written in place."""
+        fc = np.array([-8.0, -2.0, 1.0, 4.0], dtype=np.float32)
+        lr = fold_change_to_log_ratio(fc, base=2)
+        assert lr.dtype == np.float32
+        np.testing.assert_allclose(lr, [-3.0, -1.0, 0.0, 2.0], atol=1e-6)
+        assert log_ratio_to_fold_change(lr, base=2, out=lr) is lr
+        np.testing.assert_allclose(lr, fc, rtol=1e-6)
+        out = np.empty(4)
+        fold_change_to_log_ratio(fc, out=out, dtype=np.float64)
+        np.testing.assert_allclose(out, [-3.0, -1.0, 0.0, 2.0])
+
+    def test_pandas(self) -> None:
+        """Pandas input keeps its labels and is returned without copying."""
+        fc = pd.Series([-8.0, 1.0, 4.0], index=["a", "b", "c"], name="fc")
+        lr = fold_change_to_log_ratio(fc)
+        pd.testing.assert_series_equal(lr, pd.Series([-3.0, 0.0, 2.0], index=fc.index, name="fc"))
+        out = np.empty(3)
+        assert np.shares_memory(fold_change_to_log_ratio(fc, out=out).to_numpy(), out)
+        df = pd.DataFrame({"x": [-2.0, 0.0], "y": [1.0, 3.0]}, index=["g1", "g2"])
+        result = log_ratio_to_fold_change(df)
+        pd.testing.assert_frame_equal(
+            result, pd.DataFrame({"x": [-4.0, 1.0], "y": [2.0, 8.0]}, index=df.index)
+        )
+        with pytest.raises(TypeError, match="ndarray"):
+            fold_change_to_log_ratio(fc, out=fc)
+
     def test_roundtrip(self) -> None:
         """Full roundtrip: fc → lr → fc recovers original value."""
         for fc in [-8.0, -4.0, -2.0, 1.0, 2.0, 4.0, 8.0]:
@@ -165,3 +403,221 @@ class TestRankedMatrix:
         df = pd.DataFrame({"v": [5, 3, 1]}, index=["r1", "r2", "r3"])
         result = ranked_matrix(df)
         assert list(result.index) == ["r1", "r2", "r3"]
+
+    def test_matches_pandas(self) -> None:
+        """NumPy ranks match pandas, including ties and NaN."""
+        rng = np.random.default_rng(0)
+        x = rng.integers(0, 5, size=(40, 6)).astype(float)
+        x[rng.random(x.shape) < 0.1] = np.nan
+        expected = pd.DataFrame(x).rank(method="average").to_numpy()
+        np.testing.assert_array_equal(ranked_matrix(x), expected)
+        np.testing.assert_array_equal(ranked_matrix(x, workers=3), expected)
+        np.testing.assert_array_equal(ranked_matrix(x[:, 0]), expected[:, 0])
+
+    def test_float32(self) -> None:
+        """Ranks can be returned as float32."""
+        result = ranked_matrix(np.array([[3, 1], [1, 1], [2, 5]]), dtype=np.float32)
+        assert result.dtype == np.float32
+        assert result[:, 1].tolist() == [1.5, 1.5, 3.0]
+
+    def test_empty(self) -> None:
+        """Zero-row input gives an empty result."""
+        result = ranked_matrix(pd.DataFrame({"a": []}))
+        assert result.shape == (0, 1)
+        assert ranked_matrix(np.empty((0, 3))).shape == (0, 3)
+
+    def test_non_numeric(self) -> None:
+        """Non-numeric columns are ranked as by pandas."""
+        df = pd.DataFrame({"a": ["b", "a", "b"], "b": [3, 1, 2]})
+        pd.testing.assert_frame_equal(ranked_matrix(df), df.rank(method="average"))
+
+    def test_sparse(self) -> None:
+        """Sparse ranks match dense ranks, with zeros sharing one rank."""
+        x = np.array(
+            [
+                [0.0, 2.0, 0.0],
+                [-1.0, 0.0, 0.0],
+                [3.0, 2.0, 0.0],
+                [0.0, 0.0, 1.0],
+                [2.0, -5.0, 0.0],
+            ]
+        )
+        expected = ranked_matrix(x)
+        ranks, zero_ranks = ranked_matrix(scipy.sparse.csr_array(x), workers=2)
+        assert scipy.sparse.issparse(ranks)
+        assert ranks.format == "csr"
+        dense = np.where(x == 0, zero_ranks, ranks.toarray())
+        np.testing.assert_array_equal(dense, expected)
+
+
+class TestQuantileNormalize:
+    """Tests for quantile_normalize."""
+
+    def test_basic(self) -> None:
+        """Columns share the reference distribution in their original order."""
+        x = np.array([[5.0, 4.0, 3.0], [2.0, 1.0, 4.0], [3.0, 4.0, 6.0], [4.0, 2.0, 8.0]])
+        result = quantile_normalize(x)
+        reference = np.sort(x, axis=0).mean(axis=1)
+        # Column 0 has no ties: values are the reference in rank order.
+        np.testing.assert_allclose(result[:, 0], reference[np.argsort(np.argsort(x[:, 0]))])
+        # Column 1 ties (4, 4) at the top share the mean of the top two.
+        assert result[0, 1] == result[2, 1] == pytest.approx(reference[2:].mean())
+
+    def test_dataframe_workers(self) -> None:
+        """Data frames keep labels; threads give the same result."""
+        rng = np.random.default_rng(0)
+        df = pd.DataFrame(rng.integers(0, 4, size=(20, 5)), index=[f"g{i}" for i in range(20)])
+        result = quantile_normalize(df)
+        assert list(result.index) == list(df.index)
+        pd.testing.assert_frame_equal(quantile_normalize(df, workers=3), result)
+
+    def test_in_place(self) -> None:
+        """Out may be the input itself."""
+        x = np.random.default_rng(1).normal(size=(10, 3)).astype(np.float32)
+        expected = quantile_normalize(x.copy())
+        assert quantile_normalize(x, out=x) is x
+        np.testing.assert_allclose(x, expected)
+
+    def test_nan(self) -> None:
+        """Missing values raise ValueError."""
+        with pytest.raises(ValueError, match="NaN"):
+            quantile_normalize(np.array([[1.0], [np.nan]]))
+
+    def test_not_matrix(self) -> None:
+        """Vector input raises ValueError."""
+        with pytest.raises(ValueError, match="2-D"):
+            quantile_normalize(np.array([1.0, 2.0]))
+
+    def test_frame_out(self) -> None:
+        """A data frame as out raises TypeError."""
+        df = pd.DataFrame({"a": [1.0, 2.0], "b": [2.0, 1.0]})
+        with pytest.raises(TypeError, match="ndarray"):
+            quantile_normalize(df, out=df)
+
+
+class TestGrouped:
+    """Tests for grouped_geometric_mean, grouped_sem, and grouped_zscore."""
+
+    @pytest.fixture
+    def data(self) -> tuple[pd.DataFrame, np.ndarray]:
+        """Samples by genes with a group label per sample."""
+        rng = np.random.default_rng(0)
+        df = pd.DataFrame(rng.uniform(0.5, 10, size=(12, 3)), columns=["a", "b", "c"])
+        groups = np.array(["y", "x", "z"] * 4)
+        return df, groups
+
+    def test_geometric_mean(self, data: tuple[pd.DataFrame, np.ndarray]) -> None:
+        """Matches geometric_mean applied per group."""
+        df, groups = data
+        df.iloc[0, 0] = 0.0
+        df.iloc[1, 1] = np.nan
+        result = grouped_geometric_mean(df, groups)
+        assert list(result.index) == ["x", "y", "z"]
+        for label, sub in df.groupby(groups):
+            np.testing.assert_allclose(result.loc[label], geometric_mean(sub.to_numpy(), axis=0))
+
+    def test_sem(self, data: tuple[pd.DataFrame, np.ndarray]) -> None:
+        """Matches pandas groupby sem."""
+        df, groups = data
+        pd.testing.assert_frame_equal(grouped_sem(df, groups), df.groupby(groups).sem())
+
+    def test_zscore(self, data: tuple[pd.DataFrame, np.ndarray]) -> None:
+        """Matches zscore within each group; unlabelled rows are NaN."""
+        df, groups = data
+        groups = groups.astype(object)
+        groups[5] = None
+        result = grouped_zscore(df.to_numpy(), groups)
+        mask = groups == "x"
+        np.testing.assert_allclose(result[mask], zscore(df.to_numpy()[mask]))
+        assert np.isnan(result[5]).all()
+
+    def test_series(self, data: tuple[pd.DataFrame, np.ndarray]) -> None:
+        """Series results are labelled by group, or keep their index."""
+        df, groups = data
+        s = df["a"]
+        pd.testing.assert_series_equal(grouped_sem(s, groups), s.groupby(groups).sem())
+        result = grouped_geometric_mean(s, groups)
+        assert list(result.index) == ["x", "y", "z"]
+        assert result.name == "a"
+        assert grouped_zscore(s, groups).index.equals(s.index)
+
+    def test_all_missing(self) -> None:
+        """Without any labelled rows, results have no groups."""
+        x = np.ones((3, 2))
+        labels = [None, None, None]
+        assert grouped_sem(x, labels).shape == (0, 2)
+        assert grouped_geometric_mean(x, labels).shape == (0, 2)
+        assert np.isnan(grouped_zscore(x, labels)).all()
+
+    def test_length_mismatch(self) -> None:
+        """Mismatched labels raise ValueError."""
+        with pytest.raises(ValueError, match="group labels"):
+            grouped_sem(np.ones((3, 2)), ["a", "b"])
+
+
+class TestEngine:
+    """Tests for the threads and processes engines of column-wise kernels."""
+
+    @pytest.fixture(autouse=True)
+    def _cpus(self, monkeypatch: pytest.MonkeyPatch) -> None:
+        """Report four CPUs, so blocks are split even on a single-CPU machine."""
+        monkeypatch.setattr(acidbase._math, "cpus", lambda n=1: 4 if n <= 0 else n)
+
+    @pytest.fixture
+    def matrix(self) -> np.ndarray:
+        """Positive matrix with ties."""
+        rng = np.random.default_rng(0)
+        return rng.integers(1, 6, size=(50, 7)).astype(float)
+
+    @pytest.mark.parametrize("engine", ["threads", "processes"])
+    def test_ranked_matrix(self, matrix: np.ndarray, engine: str) -> None:
+        """Ranks match the serial path."""
+        result = ranked_matrix(matrix, workers=2, engine=engine)
+        np.testing.assert_array_equal(result, ranked_matrix(matrix))
+
+    @pytest.mark.parametrize("axis", [0, 1])
+    def test_geometric_mean(self, matrix: np.ndarray, axis: int) -> None:
+        """Geometric means match the serial path along either axis."""
+        result = geometric_mean(matrix, axis=axis, workers=2, engine="processes")
+        np.testing.assert_allclose(result, geometric_mean(matrix, axis=axis))
+
+    @pytest.mark.parametrize("engine", ["threads", "processes"])
+    def test_quantile_normalize(self, matrix: np.ndarray, engine: str) -> None:
+        """Quantile normalisation matches the serial path."""
+        result = quantile_normalize(matrix, workers=2, engine=engine)
+        np.testing.assert_allclose(result, quantile_normalize(matrix))
+
+    def test_geometric_mean_vector(self) -> None:
+        """A vector is computed directly instead of split into blocks."""
+        x = np.array([1.0, 2.0, 4.0])
+        assert geometric_mean(x, axis=0, workers=2, engine="processes") == pytest.approx(2.0)
+
+    def test_zscore(self, matrix: np.ndarray) -> None:
+        """Z-scores match the serial path and are written into out."""
+        out = np.empty_like(matrix)
+        assert zscore(matrix, out=out, workers=2, engine="processes") is out
+        np.testing.assert_allclose(out, zscore(matrix))
+
+    def test_default_workers(self, matrix: np.ndarray) -> None:
+        """Processes default to every CPU; a single block stays in-process."""
+        assert acidbase._math._n_workers(None, "processes") == 4
+        assert acidbase._math._n_workers(None, "threads") == 1
+        x = matrix[:, :2]
+        np.testing.assert_array_equal(ranked_matrix(x, engine="processes"), ranked_matrix(x))
+
+    def test_single_block(self, matrix: np.ndarray, monkeypatch: pytest.MonkeyPatch) -> None:
+        """One worker runs the kernel without starting a process pool."""
+        monkeypatch.setattr(acidbase._math, "ProcessPoolExecutor", None)
+        result = ranked_matrix(matrix, workers=1, engine="processes")
+        np.testing.assert_array_equal(result, ranked_matrix(matrix))
+
+    def test_invalid(self, matrix: np.ndarray) -> None:
+        """Unknown engines and unsupported input raise ValueError."""
+        with pytest.raises(ValueError, match="engine"):
+            ranked_matrix(matrix, engine="gpu")
+        with pytest.raises(ValueError, match="engine"):
+            geometric_mean(matrix[:, 0], engine="gpu")
+        with pytest.raises(ValueError, match="axis"):
+            geometric_mean(matrix, engine="processes")
+        with pytest.raises(ValueError, match="chunksize"):
+            zscore(matrix, chunksize=10, engine="processes")